@@ -1,167 +1,397 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Body
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
 from sqlalchemy.orm import Session
-import shutil
-import uuid
+from typing import List, Optional
+from datetime import datetime
+import asyncio
+import time
+import traceback
+import zipfile
+import json
 import os
 
-from backend.services.shap_explainer import get_shap_values
-from backend.services.genai_narrative import generate_ai_narrative
-from backend.services.document_parser import extract_text_from_pdf
 from dotenv import load_dotenv
 load_dotenv()
 
-from backend.services.novelty_engine import novelty_analysis
-from backend.services.financial_checker import check_finance
-
-from backend.services.explainability import (
-    generate_explanation,
-    get_feature_importance
+from backend.services.reviewer_chatbot import (
+    reviewer_chat_response,
+    stream_reviewer_chat_response
+)
+from backend.services.genai_narrative import stream_ai_narrative
+from backend.services.evaluation_pipeline import (
+    evaluate_batch,
+    proposal_stages,
+    run_stage_graph,
+    ProposalRejected,
+    SCORING_STAGES,
+    MIN_TEXT_LENGTH
 )
+from backend.services.report_generator import new_report_filename
+from backend.services.report_renderer import ensure_report, get_render_status
+from backend.services.document_parser import has_min_text
+from backend.services.budget_extractor import budget_error
+from backend.services.job_queue import enqueue_job, find_active_job, get_job
+from backend.services.evaluation_cache import (
+    save_upload_hashed,
+    get_cached_result,
+    store_cached_result
+)
+from backend.services.llm_cache import cache_stats
+from backend.services.evaluation_history import get_history_page, get_history_stats
+from backend.services.rescorer import RescoreError, rescore_evaluations
+from backend.services.warmup import is_ready, get_warmup_status
+from backend.services.corpus_service import add_projects, get_corpus_status, request_sync
 
-from backend.services.report_generator import generate_report
-from backend.services.uncertainty import estimate_confidence_band
-from backend.services.ml_evaluator import ml_evaluate_with_uncertainty
+from backend.config import PDF_CHECK_PAGES, PDF_MAX_PAGES, PDF_MAX_CHARS
+from backend.config import HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE, HISTORY_BINS
+from backend.database import get_db, SessionLocal
 
-from backend.services.reviewer_chatbot import reviewer_chat_response
 
-from backend.database import get_db
-from backend.models import ProposalEvaluation
+router = APIRouter()
 
+# --------------------------------------------------
+# LIVENESS / READINESS
+# --------------------------------------------------
+@router.get("/health")
+def health():
+    return {"status": "ok"}
 
-router = APIRouter()
 
-# ---------------- Budget Limits ----------------
-MIN_BUDGET = 100000      # ₹1 Lakh
-MAX_BUDGET = 500000000   # ₹50 Crore
+@router.get("/ready")
+def ready():
+    """
+    200 once the start-up warm-up has loaded every model, 503 before.
+    """
+
+    status = get_warmup_status()
+    return JSONResponse(status_code=200 if is_ready() else 503, content=status)
 
 
 # --------------------------------------------------
 # SUBMIT PROPOSAL
 # --------------------------------------------------
 @router.post("/submit/")
-async def submit_proposal(
+def submit_proposal(
     file: UploadFile = File(...),
-    budget: float = Form(...),
+    budget: Optional[float] = Form(None),
     db: Session = Depends(get_db)
 ):
     # ---------- Budget Validation ----------
-    if budget < MIN_BUDGET or budget > MAX_BUDGET:
-        return {
-            "error": f"Budget must be between ₹{MIN_BUDGET:,} and ₹{MAX_BUDGET:,}"
-        }
+    if budget is not None and budget_error(budget):
+        return {"error": budget_error(budget)}
 
     # ---------- Save File ----------
     os.makedirs("uploads", exist_ok=True)
-    file_id = str(uuid.uuid4())
-    file_path = f"uploads/{file_id}_{file.filename}"
+    file_path, content_hash = save_upload_hashed(file.filename, file.file)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # No budget in the form: read from the PDF by the job's parse stage,
+    # so cache and in-flight lookups are keyed on the upload alone
 
-    # ---------- Extract Text ----------
-    text = extract_text_from_pdf(file_path)
+    # ---------- Cache Hit (same PDF + budget + pipeline version) ----------
+    cached = get_cached_result(db, content_hash, budget)
+    if cached is not None:
+        return {
+            "job_id": None,
+            "status": "done",
+            "cached": True,
+            "result": cached
+        }
 
-    # ---------- Random PDF Rejection ----------
-    if len(text) < 300:
+    # ---------- Same upload already in flight ----------
+    job_id = find_active_job(db, content_hash, budget)
+    if job_id is not None:
+        return {
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/jobs/{job_id}"
+        }
+
+    # ---------- Random PDF Rejection (first pages only) ----------
+    try:
+        valid = has_min_text(file_path, MIN_TEXT_LENGTH, within_pages=PDF_CHECK_PAGES)
+    except Exception:
+        valid = False
+
+    if not valid:
         return {
             "error": "Uploaded PDF does not appear to be a valid research proposal."
         }
 
-    # ---------- Novelty Benchmark ----------
-    novelty_result = novelty_analysis(text)
-    novelty_score = float(novelty_result["novelty_score"])
-    similar_projects = novelty_result["similar_projects"]
-
-    # ---------- Financial Check ----------
-    finance_result = check_finance(budget)
-    finance_score = float(finance_result["finance_score"])
-    violations = finance_result["violations"]
-
-    technical = 80.0
-
-    # ---------- ML + Confidence ----------
-    predictions = ml_evaluate_with_uncertainty(novelty_score, budget)
-    confidence_data = estimate_confidence_band(predictions)
-
-    final_score = float(confidence_data["mean"])
-    confidence = float(confidence_data["confidence"])
-
-    # ---------- Decision ----------
-    if final_score >= 85:
-        decision = "Strongly Recommended for Funding"
-    elif final_score >= 70:
-        decision = "Recommended with Minor Revisions"
-    else:
-        decision = "Not Recommended"
-
-    # ---------- GenAI Narrative ----------
-    ai_report_text = generate_ai_narrative(
-        proposal_text=text,
-        novelty=novelty_score,
-        finance=finance_score,
-        final_score=final_score,
-        decision=decision
-    )
+    # ---------- Enqueue (pipeline runs in background workers) ----------
+    job_id = enqueue_job(db, file.filename, file_path, budget, content_hash)
 
-    # ---------- Explainability ----------
-    explanation = generate_explanation(novelty_score, finance_score, technical)
-    feature_importance = get_feature_importance()
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}"
+    }
 
-    # ---------- SHAP ----------
-    shap_values = get_shap_values(
-        novelty=novelty_score,
-        finance=finance_score,
-        technical=technical
-    )
 
-    # ---------- PDF Report ----------
-    report_filename, report_path = generate_report(
-        filename="evaluation.pdf",
-        scores={
-            "novelty": novelty_score,
-            "finance": finance_score,
-            "final_score": final_score
-        },
-        decision=decision,
-        explanation=explanation,
-        ai_narrative=ai_report_text,
-        confidence_data=confidence_data
-    )
+# --------------------------------------------------
+# SUBMIT PROPOSAL (STREAMING)
+# --------------------------------------------------
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=float)}\n\n"
+
+
+def _lookup_cached(content_hash, budget):
+    db = SessionLocal()
+    try:
+        return get_cached_result(db, content_hash, budget)
+    finally:
+        db.close()
+
+
+def _store_cached(content_hash, budget, result, report_path):
+    db = SessionLocal()
+    try:
+        store_cached_result(db, content_hash, budget, result, report_path=report_path)
+    finally:
+        db.close()
+
+
+async def _stream_evaluation(file_path, filename, content_hash, budget):
+    """
+    SSE events: "budget" (when read from the PDF), "scores"
+    (deterministic results), "token" (narrative chunks), then "done"
+    with the full result incl. report_url.
+    A cache hit is sent as a single "done"; failures as "error".
+    """
+
+    try:
+        cached = await asyncio.to_thread(_lookup_cached, content_hash, budget)
+    except Exception:
+        traceback.print_exc()   # evaluate as a cache miss
+        cached = None
+
+    if cached is not None:
+        yield _sse("done", {**cached, "cached": True})
+        return
+
+    start = time.perf_counter()
+    report_filename = new_report_filename("evaluation.pdf")
+    stages = proposal_stages(file_path, filename, budget, report_filename)
+
+    # ---------- Scores (no LLM) ----------
+    try:
+        results, timings = await asyncio.to_thread(
+            run_stage_graph, {name: stages[name] for name in SCORING_STAGES}
+        )
+    except ProposalRejected as e:
+        yield _sse("error", {"error": str(e), **e.details})
+        return
+    except Exception as e:
+        yield _sse("error", {"error": f"Evaluation failed: {type(e).__name__}: {e}"})
+        return
+
+    if "budget_items" in results:
+        yield _sse("budget", {"budget": results["budget"], "budget_items": results["budget_items"]})
+
+    yield _sse("scores", {k: v for k, v in results.items() if k != "proposal_text"})
+
+    # ---------- Narrative (token stream) ----------
+    narrative_start = time.perf_counter()
+    chunks = []
+    try:
+        async for chunk in stream_ai_narrative(
+            proposal_text=results["proposal_text"],
+            novelty=results["novelty"],
+            finance=results["finance"],
+            final_score=results["final_score"],
+            decision=results["decision"]
+        ):
+            chunks.append(chunk)
+            yield _sse("token", {"text": chunk})
+    except Exception as e:
+        yield _sse("error", {"error": f"AI narrative failed: {e}"})
+        return
+
+    results["ai_report_text"] = "".join(chunks).strip()
+    timings["narrative"] = round(time.perf_counter() - narrative_start, 4)
+
+    # ---------- Report + Store ----------
+    try:
+        results, final_timings = await asyncio.to_thread(
+            run_stage_graph,
+            {name: stages[name] for name in ("report", "store")},
+            None,
+            results
+        )
+    except Exception as e:
+        yield _sse("error", {"error": f"Saving the evaluation failed: {type(e).__name__}: {e}"})
+        return
+
+    results["stage_timings"] = {**timings, **final_timings}
+    results["total_seconds"] = round(time.perf_counter() - start, 4)
+
+    try:
+        await asyncio.to_thread(
+            _store_cached, content_hash, budget, results,
+            os.path.join("reports", report_filename)
+        )
+    except Exception:
+        traceback.print_exc()   # evaluation is stored; only the cache entry is missing
+
+    yield _sse("done", results)
+
+
+@router.post("/submit/stream")
+def submit_proposal_stream(
+    file: UploadFile = File(...),
+    budget: Optional[float] = Form(None)
+):
+    # ---------- Budget Validation ----------
+    if budget is not None and budget_error(budget):
+        return {"error": budget_error(budget)}
+
+    # Saved before responding: the upload is closed once the handler returns
+    os.makedirs("uploads", exist_ok=True)
+    file_path, content_hash = save_upload_hashed(file.filename, file.file)
+
+    # ---------- Random PDF Rejection (first pages only, as /submit/) ----------
+    try:
+        valid = has_min_text(file_path, MIN_TEXT_LENGTH, within_pages=PDF_CHECK_PAGES)
+    except Exception:
+        valid = False
 
-    # ---------- Store in DB ----------
-    record = ProposalEvaluation(
-        filename=file.filename,
-        novelty=novelty_score,
-        finance=finance_score,
-        final_score=final_score,
-        decision=decision,
-        report_path=report_path
+    if not valid:
+        return {
+            "error": "Uploaded PDF does not appear to be a valid research proposal."
+        }
+
+    return StreamingResponse(
+        _stream_evaluation(file_path, file.filename, content_hash, budget),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    db.add(record)
-    db.commit()
 
-    # ---------- Response ----------
-    return {
-        "proposal_text": text,
 
-        "novelty": novelty_score,
-        "finance": finance_score,
-        "violations": violations,
-        "similar_projects": similar_projects,
+# --------------------------------------------------
+# JOB STATUS
+# --------------------------------------------------
+@router.get("/jobs/{job_id}")
+def get_job_status(job_id: str, db: Session = Depends(get_db)):
+    job = get_job(db, job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-        "final_score": final_score,
-        "confidence": confidence,
-        "confidence_band": confidence_data,
+    return job
 
-        "decision": decision,
-        "explanation": explanation,
-        "feature_importance": feature_importance,
 
-        "ai_report_text": ai_report_text,
-        "shap_values": shap_values,
+# --------------------------------------------------
+# PDF REPORTS (rendered on first download if not ready)
+# --------------------------------------------------
+@router.get("/reports/{report_filename}")
+def download_report(report_filename: str):
+    if os.path.basename(report_filename) != report_filename:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    try:
+        file_path = ensure_report(report_filename)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Report rendering failed: {e}")
+
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    return FileResponse(file_path, media_type="application/pdf", filename=report_filename)
+
+
+@router.get("/reports/{report_filename}/status")
+def report_status(report_filename: str):
+    status = get_render_status(report_filename)
+
+    if status is None:
+        if os.path.exists(os.path.join("reports", os.path.basename(report_filename))):
+            return {"report_filename": report_filename, "status": "done"}
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    return {"report_filename": report_filename, "status": status}
+
+
+# --------------------------------------------------
+# BATCH SUBMISSION
+# --------------------------------------------------
+def _budget_for(budgets, index, filename):
+    """
+    budgets is JSON: one number for every file, a list in upload
+    order, or an object keyed by filename (optional "default" key).
+    Files without a budget have it read from the PDF.
+    """
+    if isinstance(budgets, list):
+        return budgets[index] if index < len(budgets) else None
+    if isinstance(budgets, dict):
+        return budgets.get(filename, budgets.get("default"))
+    return budgets
+
+
+@router.post("/submit/batch")
+def submit_batch(
+    files: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    budgets: str = Form("{}"),
+    db: Session = Depends(get_db)
+):
+    # Plain def: FastAPI runs it in a worker thread, keeping the event loop free
+
+    try:
+        budgets = json.loads(budgets)
+    except ValueError:
+        return {"error": "budgets must be JSON: a number, a list or {filename: budget}"}
 
-        "report_url": f"http://localhost:8000/reports/{report_filename}"
+    # ---------- Save Files ----------
+    os.makedirs("uploads", exist_ok=True)
+    uploads = []
+
+    for f in files or []:
+        uploads.append((f.filename, save_upload_hashed(f.filename, f.file)[0]))
+
+    if archive is not None:
+        try:
+            with zipfile.ZipFile(archive.file) as zf:
+                for member in zf.infolist():
+                    name = os.path.basename(member.filename)
+                    if member.is_dir() or not name.lower().endswith(".pdf"):
+                        continue
+                    with zf.open(member) as src:
+                        uploads.append((name, save_upload_hashed(name, src)[0]))
+        except zipfile.BadZipFile:
+            return {"error": "archive is not a valid ZIP file"}
+
+    if not uploads:
+        return {"error": "No PDF files provided."}
+
+    # ---------- Budget Validation (per file) ----------
+    items = []
+    results = [None] * len(uploads)
+
+    for i, (filename, file_path) in enumerate(uploads):
+        budget = _budget_for(budgets, i, filename)
+
+        if budget is not None and not isinstance(budget, (int, float)):
+            budget = float("nan")   # fails the range check below
+
+        # No budget: read from the PDF in the parse pool by evaluate_batch
+        if budget is not None:
+            error = budget_error(budget)
+            if error:
+                results[i] = {"filename": filename, "error": error}
+                continue
+            budget = float(budget)
+
+        items.append((i, {"filename": filename, "file_path": file_path, "budget": budget}))
+
+    # ---------- Evaluate ----------
+    if items:
+        evaluated = evaluate_batch([item for _, item in items], db)
+        for (i, _), result in zip(items, evaluated):
+            results[i] = result
 
+    return {
+        "count": len(results),
+        "failed": sum(1 for r in results if "error" in r),
+        "results": results
     }
 
 
@@ -169,7 +399,7 @@ async def submit_proposal(
 # REVIEWER AGENT CHATBOT
 # --------------------------------------------------
 @router.post("/ask/")
-async def ask_reviewer(
+def ask_reviewer(
     question: str = Form(...),
     proposal_text: str = Form(...),
     final_score: float = Form(...),
@@ -186,24 +416,173 @@ async def ask_reviewer(
     return {"answer": answer}
 
 
+@router.post("/ask/stream")
+def ask_reviewer_stream(
+    question: str = Form(...),
+    proposal_text: str = Form(...),
+    final_score: float = Form(...),
+    decision: str = Form(...)
+):
+    summary = f"Final Score: {final_score}, Decision: {decision}"
+
+    async def events():
+        try:
+            async for chunk in stream_reviewer_chat_response(
+                question=question,
+                proposal_text=proposal_text,
+                evaluation_summary=summary
+            ):
+                yield _sse("token", {"text": chunk})
+        except Exception as e:
+            yield _sse("error", {"error": f"Reviewer agent failed: {e}"})
+            return
+
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# --------------------------------------------------
+# LLM CACHE STATS
+# --------------------------------------------------
+@router.get("/llm-cache/stats")
+def get_llm_cache_stats():
+    return cache_stats()
+
+
 # --------------------------------------------------
-# HISTORY ENDPOINT
+# HISTORY (keyset pages + SQL aggregates)
 # --------------------------------------------------
+def _history_filters(decision, min_score, max_score, created_from, created_to):
+    return {
+        "decision": decision,
+        "min_score": min_score,
+        "max_score": max_score,
+        "created_from": created_from,
+        "created_to": created_to
+    }
+
+
 @router.get("/history/")
-def get_evaluation_history(db: Session = Depends(get_db)):
-    records = (
-        db.query(ProposalEvaluation)
-        .order_by(ProposalEvaluation.id.desc())
-        .limit(10)
-        .all()
+def get_evaluation_history(
+    limit: int = HISTORY_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    decision: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Newest evaluations first. Pass the returned next_cursor back as
+    ?cursor= for the following page; it is null on the last page.
+    """
+
+    if not 1 <= limit <= HISTORY_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {HISTORY_MAX_PAGE_SIZE}")
+
+    try:
+        records, next_cursor = get_history_page(
+            db, limit, cursor,
+            **_history_filters(decision, min_score, max_score, created_from, created_to)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "items": [
+            {
+                "id": r.id,
+                "filename": r.filename,
+                "final_score": r.final_score,
+                "decision": r.decision,
+                "budget": r.budget,
+                "created_at": r.created_at.strftime("%d %b %Y, %H:%M")
+            }
+            for r in records
+        ],
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/history/stats")
+def get_evaluation_history_stats(
+    bins: int = HISTORY_BINS,
+    decision: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    if not 1 <= bins <= 100:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 100")
+
+    return get_history_stats(
+        db, bins,
+        **_history_filters(decision, min_score, max_score, created_from, created_to)
     )
 
-    return [
-        {
-            "filename": r.filename,
-            "final_score": r.final_score,
-            "decision": r.decision,
-            "created_at": r.created_at.strftime("%d %b %Y, %H:%M")
-        }
-        for r in records
-    ]
+
+# --------------------------------------------------
+# RE-SCORE STORED EVALUATIONS
+# --------------------------------------------------
+@router.post("/history/rescore")
+def rescore_history(refeature: bool = False, dry_run: bool = False):
+    """
+    Applies the current model, guideline rules and thresholds to every
+    stored evaluation from its persisted features (no PDF re-parsing).
+    503 when the trained model is not loaded.
+    """
+
+    try:
+        return rescore_evaluations(refeature=refeature, dry_run=dry_run)
+    except RescoreError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+# --------------------------------------------------
+# PAST-PROJECT CORPUS (hot reload, no restart)
+# --------------------------------------------------
+@router.get("/corpus")
+def corpus_status():
+    return get_corpus_status()
+
+
+@router.post("/corpus/reload")
+def reload_corpus(full: bool = False, wait: bool = False):
+    """
+    Picks up changes to data/past_projects.csv now instead of at the
+    next watch interval. full=true rebuilds every index from scratch.
+    Indexes are swapped in once built; requests keep using the old ones.
+    """
+
+    summary = request_sync(full=full, wait=wait)
+    return JSONResponse(
+        status_code=200 if summary else 202,
+        content={"sync": summary, "status": get_corpus_status()}
+    )
+
+
+@router.post("/corpus/projects")
+def add_corpus_projects(projects: List[dict] = Body(..., embed=True), wait: bool = False):
+    """
+    Appends newly sanctioned projects ({"project", "url"}) to the corpus
+    CSV; they are added to the novelty indexes in the background.
+    """
+
+    try:
+        added = add_projects(projects, wait=wait)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    status = get_corpus_status()
+    return JSONResponse(
+        status_code=200 if wait else 202,
+        content={"added": added, "status": status}
+    )
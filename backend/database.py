@@ -1,9 +1,55 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-DATABASE_URL = "sqlite:///./proposals.db"
+from backend.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    SQLITE_BUSY_TIMEOUT_MS
+)
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+def create_db_engine(url=DATABASE_URL):
+    """
+    SQLite: WAL journal (readers never block the writer) and a busy
+    timeout, so concurrent writers from several uvicorn workers queue for
+    the lock instead of failing with "database is locked".
+    PostgreSQL (postgresql+psycopg2://...): pre-pinged pooled connections.
+    """
+
+    pool_args = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE
+    }
+
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True, **pool_args)
+
+    in_memory = url in ("sqlite://", "sqlite:///:memory:")
+
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **({} if in_memory else pool_args)
+    )
+
+    @event.listens_for(db_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")   # durable in WAL mode, far fewer fsyncs
+        cursor.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.close()
+
+    return db_engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
 
@@ -15,3 +61,30 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def migrate_schema():
+    """
+    create_all() only creates missing tables. This adds columns and
+    indexes declared on the models but missing from existing tables,
+    so an old proposals.db keeps working after model changes.
+    """
+
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name not in existing:
+                    col_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                    ))
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -1,23 +1,37 @@
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from backend.api.proposal_routes import router
-from backend.database import Base, engine
-from ml.vector_store import load_past_projects
+from backend.database import Base, engine, migrate_schema
+from backend.services.job_queue import start_workers, stop_workers
+from backend.services.evaluation_cache import purge_stale_entries
+from backend.services.report_renderer import resume_pending_renders, stop_render_pool
+from backend.services.db_writer import stop_writer
+from backend.services.warmup import start_warmup
+from backend.services.corpus_service import start_ingest, stop_ingest
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+migrate_schema()
 
 # Create FastAPI app FIRST
 app = FastAPI(title="AI Proposal Evaluation System")
 
-# Mount static folders AFTER app is created
-app.mount("/reports", StaticFiles(directory="reports"), name="reports")
-
-# Include API routes
+# Include API routes (reports are served by GET /reports/{name}, rendered on demand)
 app.include_router(router)
 
-# Load vector DB on startup
+# Load models in the warm-up phase (GET /ready passes once it is done)
 @app.on_event("startup")
 def startup_event():
-    load_past_projects()
+    start_warmup()
+    purge_stale_entries()
+    resume_pending_renders()
+    start_workers()
+    start_ingest()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_ingest()
+    stop_workers()
+    stop_writer()
+    stop_render_pool()
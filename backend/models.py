@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, LargeBinary, UniqueConstraint, Index
 from datetime import datetime
 from backend.database import Base
 
 class ProposalEvaluation(Base):
     __tablename__ = "proposal_evaluations"
+    __table_args__ = (
+        # /history/ pages newest-first by (created_at, id), optionally per decision
+        Index("ix_evaluations_created", "created_at", "id"),
+        Index("ix_evaluations_decision_created", "decision", "created_at", "id"),
+        Index("ix_evaluations_score", "final_score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String)
@@ -12,4 +18,67 @@ class ProposalEvaluation(Base):
     final_score = Column(Float)
     decision = Column(String)
     report_path = Column(String)
+    budget = Column(Float)
+    # Kept so history can be re-scored without re-parsing (backend/services/rescorer.py)
+    proposal_text = Column(LargeBinary)     # zlib-compressed extracted text
+    features = Column(Text)                 # JSON extract_features() row
+    similar_projects = Column(Text)         # JSON novelty neighbours
+    pipeline_version = Column(String)       # PIPELINE_VERSION that produced the scores
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class EvaluationCache(Base):
+    __tablename__ = "evaluation_cache"
+    __table_args__ = (
+        UniqueConstraint("content_hash", "budget", "pipeline_version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String, index=True)     # sha256 of the uploaded PDF
+    budget = Column(Float)
+    pipeline_version = Column(String)
+    result = Column(Text)                         # JSON evaluation result
+    report_path = Column(String)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ProposalJob(Base):
+    __tablename__ = "proposal_jobs"
+
+    id = Column(String, primary_key=True)
+    filename = Column(String)
+    file_path = Column(String)
+    content_hash = Column(String, index=True)
+    budget = Column(Float)
+    status = Column(String, default="queued", index=True)   # queued | running | done | failed
+    stage = Column(String)
+    result = Column(Text)                                   # JSON, partial until done
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)      # sha256(model, temperature, prompt)
+    model = Column(String)
+    temperature = Column(Float)
+    response = Column(Text)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class ReportRender(Base):
+    __tablename__ = "report_renders"
+
+    report_filename = Column(String, primary_key=True)
+    status = Column(String, default="pending", index=True)  # pending | rendering | done | failed
+    payload = Column(Text)                                  # JSON generate_report() arguments
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    rendered_at = Column(DateTime)
@@ -1,5 +1,107 @@
 import re
 
+# One precompiled pattern, one pass per page:
+#   ₹5,00,000   INR 200000   Rs. 3.5 lakh   Rs 2 crore   45 lakh   ₹1.2 Cr
+BUDGET_PATTERN = re.compile(
+    r"""
+    (?:
+        (?P<currency>₹|\bINR\.?|\bRs\.?|\bRupees\b)\s*
+        # Each grouping must consume the whole number (no digits or ",d"
+        # left over), else ₹1,000,000 would stop at the Indian-style 1,000
+        (?P<amount>
+            \d{1,3}(?:,\d{2})*,\d{3}(?:\.\d+)?(?!,?\d)
+          | \d{1,3}(?:,\d{3})+(?:\.\d+)?(?!,?\d)
+          | \d+(?:\.\d+)?(?!,?\d)
+        )
+        (?:\s*(?P<unit>lakhs?|lacs?|crores?|cr|l)\b\.?)?
+    |
+        # No currency marker: only counted with an explicit lakh / crore unit
+        (?<![\w.,])(?P<bare_amount>\d+(?:\.\d+)?)\s*(?P<bare_unit>lakhs?|lacs?|crores?)\b
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE
+)
+
+# Accepted proposal budgets
+MIN_BUDGET = 100000      # ₹1 Lakh
+MAX_BUDGET = 500000000   # ₹50 Crore
+
+MULTIPLIERS = {
+    "l": 100000,
+    "lakh": 100000,
+    "lac": 100000,
+    "cr": 10000000,
+    "crore": 10000000
+}
+
+
+def _multiplier(unit):
+    if not unit:
+        return 1
+    unit = unit.lower().rstrip("s")
+    return MULTIPLIERS[unit]
+
+
+def iter_budget_items(pages):
+    """
+    Yields one line item per amount found, consuming page texts one at a
+    time (e.g. document_parser.iter_pdf_pages), so the whole document is
+    never held in memory:
+
+    {
+        "amount": float (rupees),
+        "text": matched text,
+        "label": rest of the line before the amount,
+        "page": page number (1-based),
+        "start" / "end": offsets in the concatenated text
+    }
+    """
+
+    offset = 0
+
+    for page_number, page_text in enumerate(pages, start=1):
+        for match in BUDGET_PATTERN.finditer(page_text):
+            if match.group("amount"):
+                amount, unit = match.group("amount"), match.group("unit")
+            else:
+                amount, unit = match.group("bare_amount"), match.group("bare_unit")
+
+            line_start = page_text.rfind("\n", 0, match.start()) + 1
+            label = page_text[line_start:match.start()].strip(" :-–\t")
+
+            yield {
+                "amount": float(amount.replace(",", "")) * _multiplier(unit),
+                "text": match.group(0).strip(),
+                "label": label,
+                "page": page_number,
+                "start": offset + match.start(),
+                "end": offset + match.end()
+            }
+
+        offset += len(page_text)
+
+
+def summarize_budget(items):
+    """
+    Total budget from line items: the largest amount on a line labelled
+    "total", otherwise the largest amount found. None if no items.
+    """
+
+    if not items:
+        return None
+
+    totals = [item["amount"] for item in items if "total" in item["label"].lower()]
+    return max(totals or [item["amount"] for item in items])
+
+
+def extract_budget_from_pages(pages):
+    items = list(iter_budget_items(pages))
+
+    return {
+        "total": summarize_budget(items),
+        "items": items
+    }
+
 
 def extract_budget_from_text(proposal_text: str):
     """
@@ -11,26 +113,33 @@ def extract_budget_from_text(proposal_text: str):
     Rs. 3.5 lakh
     """
 
-    budget_values = []
+    return summarize_budget(list(iter_budget_items([proposal_text])))
 
-    # Pattern 1: ₹1,00,000 or ₹500000
-    pattern_rupee = r"₹\s?[\d,]+"
 
-    # Pattern 2: INR 500000
-    pattern_inr = r"INR\s?[\d,]+"
+# ---------------- RANGE CHECK ----------------
+def budget_error(budget):
+    if not MIN_BUDGET <= budget <= MAX_BUDGET:
+        return f"Budget must be between ₹{MIN_BUDGET:,} and ₹{MAX_BUDGET:,}"
+    return None
 
-    # Find matches
-    matches = re.findall(pattern_rupee, proposal_text)
-    matches += re.findall(pattern_inr, proposal_text)
 
-    for m in matches:
-        num = re.sub(r"[₹,INR\s]", "", m)
-        if num.isdigit():
-            budget_values.append(float(num))
+def resolve_budget(budget, detected=None):
+    """
+    Returns (budget, detected_items, error) for a form budget, or, when
+    the form gave none, for the budget read from the proposal
+    (detected = extract_budget_from_pages(...) over the parsed pages).
+    detected_items is None when the budget came from the form.
+    """
 
-    # If nothing found
-    if not budget_values:
-        return None
+    if budget is not None:
+        return budget, None, budget_error(budget)
+
+    budget, items = detected["total"], detected["items"]
+    if budget is None:
+        return None, items, "No budget found in the proposal. Please enter the budget."
+
+    error = budget_error(budget)
+    if error:
+        error = f"Budget read from the proposal (₹{budget:,.0f}) is out of range. {error}"
 
-    # Return maximum budget found
-    return max(budget_values)
+    return budget, items, error
@@ -0,0 +1,446 @@
+"""
+Past-project corpus
+-------------------
+The one reader of data/past_projects.csv. The TF-IDF novelty index
+(similarity_engine), the FAISS index (ml/vector_store) and
+past_project_db all take their project list from here.
+
+- get_projects():  current rows as [{"project", "url", ...other columns}]
+- sync_corpus():   picks up changes to the CSV. Rows appended since the
+                   last read are parsed from the last byte offset and
+                   added to the loaded indexes incrementally; any other
+                   change (rows edited, removed, file replaced) re-reads
+                   the file and rebuilds the indexes
+- add_projects():  appends rows to the CSV, then syncs
+
+Syncs run on one background thread ("corpus-ingest"), which also polls
+the CSV every CORPUS_WATCH_INTERVAL seconds. Updated indexes are built
+next to the live ones and published with a single assignment, so
+requests in flight keep reading the previous, complete index and never
+wait on an ingest.
+"""
+
+import csv
+import importlib
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+
+from backend.config import CORPUS_WATCH_INTERVAL
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CSV_PATH = os.path.join(ROOT_DIR, "data", "past_projects.csv")
+
+# Derived indexes: name -> (module, live index attribute, loader,
+# incremental add(new projects), full rebuild). Imported lazily.
+INDEXES = {
+    "novelty": (
+        "backend.services.similarity_engine", "novelty_index",
+        "load_novelty_index", "add_projects", "build_novelty_index"
+    ),
+    "vector": (
+        "ml.vector_store", "vector_index",
+        "load_vector_index", "add_vectors", "build_vector_index"
+    )
+}
+
+# Replaced as a whole on every change, never mutated
+_corpus = None
+_version = 0
+# One sync / index load at a time; re-entrant because loaders read the corpus
+_ingest_lock = threading.RLock()
+
+_status = {
+    "syncing": False,
+    "last_sync": None,      # summary of the last sync_corpus()
+    "error": None
+}
+
+_wake = threading.Event()
+_stop = threading.Event()
+_done = threading.Condition()
+_requested = 0              # sync requests made
+_completed = 0              # sync requests served
+_full_requested = False
+_thread = None
+
+
+# ---------- Reading the CSV ----------
+def _normalise(record):
+    return {
+        **record,
+        "project": str(record.get("project") or ""),
+        "url": str(record.get("url") or "")
+    }
+
+
+def _parse(data, columns=None):
+    """
+    Rows in data (bytes). Reads the header first when columns is None.
+    """
+
+    reader = csv.reader(io.StringIO(data.decode("utf-8-sig")))
+
+    if columns is None:
+        columns = [c.strip() for c in next(reader, [])]
+        if "project" not in columns:
+            raise ValueError("CSV must contain a 'project' column")
+
+    projects = [
+        _normalise(dict(zip(columns, row)))
+        for row in reader
+        if row
+    ]
+    return columns, projects
+
+
+def _file_state(path):
+    stat = os.stat(path)
+    return {"inode": stat.st_ino, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_full(path):
+    if not os.path.exists(path):
+        print("❌ past_projects.csv not found!")
+        return {"path": path, "columns": ["project", "url"], "projects": [],
+                "offset": 0, "tail": b"", "file": None, "version": _next_version()}
+
+    file_state = _file_state(path)
+    with open(path, "rb") as f:
+        data = f.read(file_state["size"])
+
+    columns, projects = _parse(data)
+    return {
+        "path": path,
+        "columns": columns,
+        "projects": projects,
+        "offset": len(data),
+        "tail": data[-256:],        # detects edits before the offset
+        "file": file_state,
+        "version": _next_version()
+    }
+
+
+def _read_appended(corpus):
+    """
+    Corpus plus the rows appended since it was read, or None when the
+    file changed in any other way and has to be re-read in full.
+    """
+
+    path = corpus["path"]
+    if corpus["file"] is None or not os.path.exists(path):
+        return None
+
+    file_state = _file_state(path)
+    offset = corpus["offset"]
+    tail = corpus["tail"]
+
+    if file_state["inode"] != corpus["file"]["inode"] or file_state["size"] < offset:
+        return None
+    if file_state["size"] == offset:
+        return corpus if file_state["mtime_ns"] == corpus["file"]["mtime_ns"] else None
+    if tail and not tail.endswith(b"\n"):
+        return None     # last row had no line break: the append joined it
+
+    with open(path, "rb") as f:
+        f.seek(offset - len(tail))
+        if f.read(len(tail)) != tail:
+            return None
+        data = f.read(file_state["size"] - offset)
+
+    # Only whole lines: a writer may be mid-append
+    data = data[:data.rfind(b"\n") + 1]
+    if not data:
+        return corpus
+
+    _, added = _parse(data, corpus["columns"])
+    consumed = tail + data
+    return {
+        **corpus,
+        "projects": corpus["projects"] + added,
+        "offset": offset + len(data),
+        "tail": consumed[-256:],
+        "file": {**file_state, "size": offset + len(data)},
+        "version": _next_version()
+    }
+
+
+def _next_version():
+    global _version
+    _version += 1
+    return _version
+
+
+# ---------- Corpus ----------
+def load_corpus(path=CSV_PATH):
+    global _corpus
+
+    with _ingest_lock:
+        _corpus = _read_full(path)
+
+    print("✅ Past Projects Loaded Successfully:", len(_corpus["projects"]))
+    return _corpus["projects"]
+
+
+def get_projects():
+    """
+    Current corpus rows. The list is replaced, never changed in place,
+    so callers can keep iterating it while an update is published.
+    """
+
+    if _corpus is None:
+        load_corpus()
+    return _corpus["projects"]
+
+
+def appended_since(indexed_projects):
+    """
+    Corpus rows added after indexed_projects (possibly none), or None
+    when the corpus no longer starts with them and an index built from
+    them has to be rebuilt.
+    """
+
+    projects = get_projects()
+    if len(indexed_projects) > len(projects):
+        return None
+
+    for old, new in zip(indexed_projects, projects):
+        if old["project"] != new["project"] or old["url"] != new["url"]:
+            return None
+
+    return projects[len(indexed_projects):]
+
+
+def add_projects(projects, path=CSV_PATH, wait=False):
+    """
+    Appends {"project", "url", ...} rows to the CSV (source of truth for
+    every rebuild) and requests a sync. Returns the number of rows.
+    """
+
+    rows = [_normalise(p) for p in projects]
+    if any(not row["project"].strip() for row in rows):
+        raise ValueError("Every project needs a non-empty 'project' title")
+    if not rows:
+        return 0
+
+    get_projects()
+    columns = _corpus["columns"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        writer.writerow(columns)
+    else:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                buffer.write("\n")
+
+    for row in rows:
+        writer.writerow([row.get(c, "") for c in columns])
+
+    # One write on an O_APPEND file: concurrent appends do not interleave
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(buffer.getvalue())
+
+    request_sync(wait=wait)
+    return len(rows)
+
+
+# ---------- Derived indexes ----------
+def _index_parts(name):
+    module_name, attribute, load, add, build = INDEXES[name]
+    module = importlib.import_module(module_name)
+    return module, attribute, getattr(module, load), getattr(module, add), getattr(module, build)
+
+
+def load_index(name):
+    """
+    Loads one derived index (warm-up step), in step with ingests.
+    """
+
+    _, _, load, _, _ = _index_parts(name)
+    with _ingest_lock:
+        return load()
+
+
+def _refresh_indexes(rebuild):
+    """
+    Brings every loaded index up to the current corpus. Indexes not
+    loaded yet catch up from the corpus when they load.
+    """
+
+    summary = {}
+    for name in INDEXES:
+        module, attribute, _, add, build = _index_parts(name)
+        live = getattr(module, attribute)
+        if live is None:
+            continue
+
+        start = time.perf_counter()
+        added = None if rebuild else appended_since(live["projects"])
+
+        if added is None:
+            build()
+            summary[name] = "rebuilt"
+        elif added:
+            add(added)
+            summary[name] = f"+{len(added)}"
+        else:
+            summary[name] = "unchanged"
+
+        summary[name] += f" ({time.perf_counter() - start:.2f}s)"
+
+    return summary
+
+
+def sync_corpus(full=False):
+    """
+    Re-reads the CSV (only appended rows unless full) and updates the
+    loaded indexes. Returns a summary of what changed.
+    """
+
+    global _corpus
+
+    start = time.perf_counter()
+
+    with _ingest_lock:
+        _status["syncing"] = True
+        try:
+            previous = _corpus
+            corpus = None if full or previous is None else _read_appended(previous)
+            mode = "append"
+            if corpus is None:
+                corpus = _read_full(previous["path"] if previous else CSV_PATH)
+                mode = "reload"
+
+            _corpus = corpus
+            changed = previous is None or corpus is not previous
+
+            indexes = _refresh_indexes(rebuild=full) if changed else {}
+            _status["error"] = None
+
+        except Exception as e:
+            # Keep the corpus the indexes were last brought up to, so the
+            # next sync sees the change again and retries the refresh
+            _corpus = previous
+            _status["error"] = f"{type(e).__name__}: {e}"
+            raise
+
+        finally:
+            _status["syncing"] = False
+
+        summary = {
+            "mode": mode if changed else "unchanged",
+            "projects": len(corpus["projects"]),
+            "added": len(corpus["projects"]) - len(previous["projects"]) if previous else None,
+            "indexes": indexes,
+            "version": corpus["version"],
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+        _status["last_sync"] = summary
+
+    if changed:
+        print(f"✅ Corpus {summary['mode']}: {summary['projects']} projects {indexes}")
+    return summary
+
+
+# ---------- Ingest thread (watch + admin requests) ----------
+def _run(interval):
+    global _completed, _full_requested
+
+    while not _stop.is_set():
+        _wake.wait(interval or None)
+        _wake.clear()
+        if _stop.is_set():
+            break
+
+        with _done:
+            served = _requested
+            full = _full_requested
+            _full_requested = False
+
+        try:
+            sync_corpus(full=full)
+        except Exception:
+            traceback.print_exc()
+
+        with _done:
+            _completed = max(_completed, served)
+            _done.notify_all()
+
+
+def start_ingest(interval=CORPUS_WATCH_INTERVAL):
+    """
+    Starts the ingest thread; it checks the CSV every interval seconds
+    (0 disables watching: only request_sync() triggers an ingest).
+    """
+
+    global _thread
+
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(interval,), name="corpus-ingest", daemon=True)
+    _thread.start()
+
+
+def stop_ingest(timeout=10):
+    global _thread
+
+    if _thread is None:
+        return
+    _stop.set()
+    _wake.set()
+    _thread.join(timeout)
+    _thread = None
+
+
+def request_sync(full=False, wait=False, timeout=None):
+    """
+    Asks the ingest thread for a sync (runs it inline when the thread is
+    not running). wait=True blocks until that sync has finished.
+    """
+
+    global _requested, _full_requested
+
+    if _thread is None or not _thread.is_alive():
+        return sync_corpus(full=full)
+
+    with _done:
+        _requested += 1
+        ticket = _requested
+        _full_requested = _full_requested or full
+    _wake.set()
+
+    if wait:
+        with _done:
+            _done.wait_for(lambda: _completed >= ticket, timeout)
+        return get_corpus_status()["last_sync"]
+
+    return None
+
+
+def get_corpus_status():
+    indexes = {}
+    for name, (module_name, attribute, *_) in INDEXES.items():
+        live = None
+        module = sys.modules.get(module_name)
+        if module is not None:
+            live = getattr(module, attribute)
+        indexes[name] = len(live["projects"]) if live else None
+
+    corpus = _corpus
+    return {
+        "path": corpus["path"] if corpus else CSV_PATH,
+        "projects": len(corpus["projects"]) if corpus else None,
+        "version": corpus["version"] if corpus else None,
+        "indexes": indexes,
+        "watching": _thread is not None and _thread.is_alive(),
+        "watch_interval": CORPUS_WATCH_INTERVAL,
+        **_status
+    }
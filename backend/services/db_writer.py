@@ -0,0 +1,126 @@
+"""
+Group commit for evaluation rows
+--------------------------------
+Concurrent requests each storing one ProposalEvaluation would each
+take the database write lock and fsync on their own. Instead they hand
+the row to one writer thread per process, which inserts everything that
+arrived within DB_WRITE_MAX_DELAY (up to DB_WRITE_BATCH_SIZE rows) in a
+single transaction. Callers wait on the returned Future, so a row is
+committed when it resolves, just as with a direct commit. If the batch
+fails, its rows are retried one by one and only the failing row's
+Future gets the error.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import insert
+
+from backend.config import DB_WRITE_BATCH_SIZE, DB_WRITE_MAX_DELAY
+from backend.database import SessionLocal
+from backend.models import ProposalEvaluation
+
+_queue = queue.Queue()
+_thread = None
+_lock = threading.Lock()
+_STOP = object()
+
+
+def _insert(rows):
+    db = SessionLocal()
+    try:
+        db.execute(insert(ProposalEvaluation), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _flush(batch):
+    try:
+        _insert([row for row, _ in batch])
+    except Exception as e:
+        if len(batch) == 1:
+            batch[0][1].set_exception(e)
+            return
+
+        # One bad row must not fail the requests it was grouped with:
+        # retry them one at a time, so only that row's caller gets the error
+        for row, future in batch:
+            try:
+                _insert([row])
+            except Exception as row_error:
+                future.set_exception(row_error)
+            else:
+                future.set_result(None)
+        return
+
+    for _, future in batch:
+        future.set_result(None)
+
+
+def _writer_loop():
+    while True:
+        item = _queue.get()
+        if item is _STOP:
+            return
+
+        batch = [item]
+        deadline = time.monotonic() + DB_WRITE_MAX_DELAY
+        stop = False
+
+        while len(batch) < DB_WRITE_BATCH_SIZE:
+            try:
+                item = _queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+
+        _flush(batch)
+
+        if stop:
+            return
+
+
+def _ensure_writer():
+    global _thread
+
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_writer_loop, name="db-writer", daemon=True)
+            _thread.start()
+
+
+def write_evaluation(fields):
+    """
+    Queues one ProposalEvaluation row (column -> value).
+    Returns a Future that resolves once the row is committed.
+    """
+
+    _ensure_writer()
+
+    future = Future()
+    _queue.put((fields, future))
+    return future
+
+
+def stop_writer():
+    """
+    Commits everything still queued, then stops the writer thread.
+    """
+
+    global _thread
+
+    with _lock:
+        if _thread is None:
+            return
+        _queue.put(_STOP)
+        _thread.join()
+        _thread = None
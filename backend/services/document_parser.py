@@ -1,8 +1,180 @@
-import pdfplumber
+import multiprocessing
+import os
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-def extract_text_from_pdf(file_path):
-    text = ""
+from backend.config import PDF_PARALLEL_WORKERS, PDF_PARALLEL_MIN_PAGES
+
+# Process pools for page-parallel extraction, keyed by worker count
+_page_pools = {}
+_page_pools_lock = threading.Lock()
+
+
+def iter_pdf_pages(file_path, max_pages=None, max_chars=None):
+    """
+    Yields the text of each page lazily, in order.
+
+    Stops after max_pages pages or once max_chars characters have been
+    yielded (the last page is trimmed). Pages are only laid out when the
+    caller asks for them, so breaking out of the loop early skips the
+    rest of the document.
+    """
+
+    import pdfplumber
+
+    remaining = max_chars
+
+    with pdfplumber.open(file_path) as pdf:
+        for number, page in enumerate(pdf.pages):
+            if max_pages is not None and number >= max_pages:
+                break
+
+            page_text = page.extract_text() or ""
+            page.close()  # drop cached layout objects
+
+            if remaining is not None:
+                page_text = page_text[:remaining]
+                remaining -= len(page_text)
+
+            yield page_text
+
+            if remaining is not None and remaining <= 0:
+                break
+
+
+def extract_text_from_pdf(file_path, max_pages=None, max_chars=None):
+    return "".join(iter_pdf_pages(file_path, max_pages, max_chars))
+
+
+def has_min_text(file_path, min_chars, within_pages=None):
+    """
+    True once min_chars characters are found, reading as few pages as
+    possible. Used to reject scanned / junk uploads cheaply.
+    """
+
+    found = 0
+    for page_text in iter_pdf_pages(file_path, max_pages=within_pages):
+        found += len(page_text)
+        if found >= min_chars:
+            return True
+
+    return False
+
+
+# ---------------- PAGE-PARALLEL EXTRACTION ----------------
+def count_pages(file_path):
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_range(file_path, start, stop):
+    import pdfplumber
+
+    texts = []
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or "")
+            page.close()
+    return texts
+
+
+def _get_page_pool(workers):
+    with _page_pools_lock:
+        if workers not in _page_pools:
+            _page_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pools[workers]
+
+
+def _drop_page_pool(workers, pool):
+    # A worker died (e.g. OOM on a huge PDF): the next call starts a fresh pool
+    with _page_pools_lock:
+        if _page_pools.get(workers) is pool:
+            del _page_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pages_parallel(file_path, max_pages=None, max_chars=None,
+                           workers=None, min_pages=None):
+    """
+    Page texts in order, with the same limits as iter_pdf_pages(), from
+    page ranges parsed in a process pool. Falls back to serial
+    extraction for documents shorter than min_pages
+    (PDF_PARALLEL_MIN_PAGES), where process start-up and re-opening the
+    file cost more than they save.
+
+    Ranges are submitted a few at a time in page order, so once
+    max_chars is reached no further pages are parsed.
+    """
+
+    workers = workers or PDF_PARALLEL_WORKERS or os.cpu_count()
+    min_pages = PDF_PARALLEL_MIN_PAGES if min_pages is None else min_pages
+
+    total = count_pages(file_path)
+    if max_pages is not None:
+        total = min(total, max_pages)
+
+    if workers < 2 or total < max(min_pages, 2):
+        return list(iter_pdf_pages(file_path, max_pages, max_chars))
+
+    # ~2 ranges per worker so one table-heavy range does not stall the rest
+    size = max(1, -(-total // (workers * 2)))
+    pool = _get_page_pool(workers)
+    ranges = iter(range(0, total, size))
+
+    def submit_next():
+        start = next(ranges, None)
+        if start is not None:
+            in_flight.append(
+                pool.submit(_extract_page_range, file_path, start, min(start + size, total))
+            )
+
+    in_flight = deque()
+    pages = []
+    remaining = max_chars
+
+    try:
+        for _ in range(workers):
+            submit_next()
+
+        while in_flight:
+            for page_text in in_flight.popleft().result():
+                if remaining is not None:
+                    page_text = page_text[:remaining]
+                    remaining -= len(page_text)
+                pages.append(page_text)
+
+                if remaining is not None and remaining <= 0:
+                    # Character budget used up: drop ranges not started yet
+                    for future in in_flight:
+                        future.cancel()
+                    return pages
+
+            submit_next()
+
+    except BrokenProcessPool:
+        _drop_page_pool(workers, pool)
+        raise
+
+    return pages
+
+
+def extract_text_parallel(file_path, max_pages=None, max_chars=None,
+                          workers=None, min_pages=None):
+    return "".join(extract_pages_parallel(file_path, max_pages, max_chars, workers, min_pages))
+
+
+# ---------- Stored text (ProposalEvaluation.proposal_text) ----------
+def compress_text(text):
+    return zlib.compress(text.encode("utf-8", "surrogatepass"), 6)
+
+
+def decompress_text(blob):
+    return zlib.decompress(blob).decode("utf-8", "surrogatepass")
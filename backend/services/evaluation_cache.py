@@ -0,0 +1,108 @@
+"""
+Content-addressed evaluation cache
+----------------------------------
+Maps (sha256 of the uploaded PDF, budget, PIPELINE_VERSION) to a
+finished evaluation, so identical resubmissions skip the pipeline,
+the paid LLM call and the report render.
+"""
+
+import hashlib
+import json
+import os
+import uuid
+
+from sqlalchemy.exc import IntegrityError
+
+from backend.config import PIPELINE_VERSION
+from backend.database import SessionLocal
+from backend.models import EvaluationCache
+from backend.services.report_renderer import report_exists
+
+CHUNK_SIZE = 1 << 20
+
+
+def save_upload_hashed(filename, fileobj, upload_dir="uploads"):
+    """
+    Streams the upload to disk while hashing it, then stores it under
+    its content hash. Re-uploads of the same file reuse the stored copy.
+    Returns (file_path, content_hash).
+    """
+
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(upload_dir, f".{uuid.uuid4().hex}.part")
+
+    with open(tmp_path, "wb") as buffer:
+        for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+
+    content_hash = digest.hexdigest()
+    extension = os.path.splitext(filename or "")[1].lower() or ".pdf"
+    file_path = os.path.join(upload_dir, f"{content_hash}{extension}")
+
+    if os.path.exists(file_path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, file_path)
+
+    return file_path, content_hash
+
+
+def get_cached_result(db, content_hash, budget):
+    entry = (
+        db.query(EvaluationCache)
+        .filter(
+            EvaluationCache.content_hash == content_hash,
+            EvaluationCache.budget == budget,
+            EvaluationCache.pipeline_version == PIPELINE_VERSION
+        )
+        .first()
+    )
+
+    if entry is None:
+        return None
+
+    # Report file cleaned up and no longer renderable -> treat as a miss
+    if entry.report_path and not report_exists(os.path.basename(entry.report_path)):
+        db.delete(entry)
+        db.commit()
+        return None
+
+    entry.hits = (entry.hits or 0) + 1
+    db.commit()
+
+    return json.loads(entry.result)
+
+
+def store_cached_result(db, content_hash, budget, result, report_path=None):
+    db.add(EvaluationCache(
+        content_hash=content_hash,
+        budget=budget,
+        pipeline_version=PIPELINE_VERSION,
+        result=json.dumps(result, default=float),
+        report_path=report_path
+    ))
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker cached the same evaluation first
+        db.rollback()
+
+
+def purge_stale_entries():
+    """
+    Drops entries written by older pipeline versions.
+    """
+
+    db = SessionLocal()
+    try:
+        count = (
+            db.query(EvaluationCache)
+            .filter(EvaluationCache.pipeline_version != PIPELINE_VERSION)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return count
+    finally:
+        db.close()
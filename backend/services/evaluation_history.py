@@ -0,0 +1,143 @@
+"""
+Evaluation history
+------------------
+Keyset-paginated browsing of stored evaluations (newest first) and
+aggregate statistics computed in SQL, both with the same filters:
+decision, score range and creation date.
+"""
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import Integer, and_, case, cast, func, or_
+
+from backend.config import HISTORY_BINS
+from backend.models import ProposalEvaluation
+
+
+# ---------- Cursor ----------
+def encode_cursor(record):
+    raw = f"{record.created_at.isoformat()}|{record.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    (created_at, id) of the last row of the previous page.
+    Raises ValueError on a malformed cursor.
+    """
+
+    try:
+        created_at, record_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(record_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+# ---------- Filters ----------
+def apply_filters(query, decision=None, min_score=None, max_score=None,
+                  created_from=None, created_to=None):
+    if decision is not None:
+        query = query.filter(ProposalEvaluation.decision == decision)
+    if min_score is not None:
+        query = query.filter(ProposalEvaluation.final_score >= min_score)
+    if max_score is not None:
+        query = query.filter(ProposalEvaluation.final_score <= max_score)
+    if created_from is not None:
+        query = query.filter(ProposalEvaluation.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(ProposalEvaluation.created_at < created_to)
+    return query
+
+
+# ---------- Pages ----------
+def get_history_page(db, limit, cursor=None, **filters):
+    """
+    One page of evaluations ordered by (created_at, id) descending.
+    The next page starts strictly after the last row of this one, so
+    page cost does not grow with depth the way OFFSET does.
+    Returns (records, next_cursor); next_cursor is None on the last page.
+    """
+
+    query = apply_filters(db.query(ProposalEvaluation), **filters)
+
+    if cursor:
+        created_at, record_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            ProposalEvaluation.created_at < created_at,
+            and_(
+                ProposalEvaluation.created_at == created_at,
+                ProposalEvaluation.id < record_id
+            )
+        ))
+
+    records = (
+        query
+        .order_by(ProposalEvaluation.created_at.desc(), ProposalEvaluation.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = encode_cursor(records[limit - 1]) if len(records) > limit else None
+    return records[:limit], next_cursor
+
+
+# ---------- Aggregates ----------
+def get_history_stats(db, bins=HISTORY_BINS, **filters):
+    """
+    Counts, score summary, decision ratios and a score histogram over
+    0-100 in `bins` equal buckets (100 falls in the last one).
+    """
+
+    score = ProposalEvaluation.final_score
+
+    total, mean, low, high = apply_filters(
+        db.query(func.count(ProposalEvaluation.id), func.avg(score), func.min(score), func.max(score)),
+        **filters
+    ).one()
+
+    decisions = apply_filters(
+        db.query(ProposalEvaluation.decision, func.count(ProposalEvaluation.id)),
+        **filters
+    ).group_by(ProposalEvaluation.decision).all()
+
+    width = 100.0 / bins
+    # CAST truncates in SQLite (whose FLOOR needs the math extension) but
+    # rounds in PostgreSQL, which would shift scores into the next bucket
+    if db.get_bind().dialect.name == "sqlite":
+        index = cast(score / width, Integer)
+    else:
+        index = cast(func.floor(score / width), Integer)
+    bucket = case(
+        (score >= 100, bins - 1),
+        (score < 0, 0),
+        else_=index
+    )
+    buckets = dict(
+        apply_filters(
+            db.query(bucket, func.count(ProposalEvaluation.id)).filter(score.isnot(None)),
+            **filters
+        ).group_by(bucket).all()
+    )
+
+    return {
+        "count": total,
+        "mean_score": round(mean, 2) if mean is not None else None,
+        "min_score": low,
+        "max_score": high,
+        "decisions": {
+            decision: {
+                "count": count,
+                "ratio": round(count / total, 4)
+            }
+            for decision, count in decisions
+        },
+        "histogram": [
+            {
+                "from": round(i * width, 2),
+                "to": round((i + 1) * width, 2),
+                "count": buckets.get(i, 0)
+            }
+            for i in range(bins)
+        ]
+    }
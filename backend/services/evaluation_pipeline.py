@@ -0,0 +1,490 @@
+"""
+Evaluation Pipeline
+-------------------
+Shared scoring steps used by the submit endpoints and job workers:
+1. Decision thresholds
+2. Single proposal evaluation (stage graph with concurrent branches)
+3. Batch evaluation (process-pool parsing + vectorized scoring)
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait
+)
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.config import (
+    BATCH_PARSE_WORKERS,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+    PIPELINE_STAGE_THREADS,
+    PIPELINE_VERSION
+)
+from backend.models import ProposalEvaluation
+from backend.services.db_writer import write_evaluation
+from backend.services.budget_extractor import extract_budget_from_pages, resolve_budget
+from backend.services.document_parser import (
+    compress_text,
+    extract_pages_parallel,
+    iter_pdf_pages
+)
+from backend.services.feature_extractor import extract_features, extract_feature_matrix
+from backend.services.novelty_engine import novelty_analysis, novelty_analysis_batch
+from backend.services.financial_checker import check_finance, check_finance_batch
+from backend.services.explainability import (
+    generate_explanation,
+    get_feature_importance
+)
+from backend.services.shap_explainer import get_shap_values
+from backend.services.genai_narrative import generate_ai_narrative
+from backend.services.report_generator import new_report_filename
+from backend.services.report_renderer import schedule_report
+from backend.services.ml_evaluator import ml_evaluate_with_uncertainty, ml_evaluate_batch
+from backend.services.uncertainty import estimate_confidence_band
+
+MIN_TEXT_LENGTH = 300
+
+_parse_pool = None
+_stage_pool = None
+_pools_lock = threading.Lock()
+
+
+# ---------------- DECISION ----------------
+def get_decision(final_score):
+    if final_score >= 85:
+        return "Strongly Recommended for Funding"
+    elif final_score >= 70:
+        return "Recommended with Minor Revisions"
+    return "Not Recommended"
+
+
+# ---------------- STAGE GRAPH ----------------
+class ProposalRejected(Exception):
+    """
+    The upload cannot be evaluated. details (e.g. budget_items) are
+    returned alongside the error message.
+    """
+
+    def __init__(self, message, **details):
+        super().__init__(message)
+        self.details = details
+
+
+def get_stage_pool():
+    global _stage_pool
+
+    with _pools_lock:
+        if _stage_pool is None:
+            _stage_pool = ThreadPoolExecutor(
+                max_workers=PIPELINE_STAGE_THREADS,
+                thread_name_prefix="pipeline-stage"
+            )
+
+        return _stage_pool
+
+
+def _timed(fn, results):
+    start = time.perf_counter()
+    output = fn(results)
+    return output, time.perf_counter() - start
+
+
+def run_stage_graph(stages, on_stage=None, results=None):
+    """
+    stages: {name: (dependencies, fn)} where fn(results) returns a dict
+    that is merged into results.
+
+    Every stage is submitted to the stage pool as soon as all of its
+    dependencies have finished, so independent branches overlap and
+    total latency is roughly the longest branch. Dependencies outside
+    `stages` count as done, so a graph can be run in parts by passing
+    the earlier part's results. on_stage(running, outputs) is called
+    from the calling thread whenever the running set changes.
+    Returns (results, timings in seconds per stage).
+    """
+
+    pool = get_stage_pool()
+    pending = dict(stages)
+    running = {}
+    results = dict(results or {})
+    timings = {}
+    finished = {}
+
+    while pending or running:
+        for name, (deps, fn) in list(pending.items()):
+            if all(dep in timings or dep not in stages for dep in deps):
+                del pending[name]
+                # Snapshot: stages never see each other's partial writes
+                running[pool.submit(_timed, fn, dict(results))] = name
+
+        if not running:
+            raise ValueError(f"Unsatisfiable stage dependencies: {sorted(pending)}")
+
+        if on_stage:
+            on_stage(", ".join(sorted(running.values())), finished)
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+        finished = {}
+        for future in done:
+            name = running.pop(future)
+            output, elapsed = future.result()
+
+            results.update(output)
+            finished.update(output)
+            timings[name] = round(elapsed, 4)
+
+    return results, timings
+
+
+# ---------------- SINGLE PROPOSAL ----------------
+# Stages whose output is known without the LLM (streamed first by /submit/stream)
+SCORING_STAGES = ["parse", "novelty", "finance", "ml", "explainability"]
+
+
+def proposal_stages(file_path, filename, budget, report_filename):
+    """
+    Stage graph of the /submit/ pipeline for one saved upload:
+
+        parse -> novelty -> ml
+        finance                          (alongside parse; after it when
+                                          budget is None and is read
+                                          from the parsed pages)
+        ml + finance -> narrative        (the LLM call, usually longest)
+        novelty + finance -> explainability
+        narrative + explainability -> report
+        narrative + report -> store      (last: a failed stage, retried by
+                                          the job queue, never leaves a row)
+    """
+
+    technical = 80.0
+    report_path = os.path.join("reports", report_filename)
+
+    def budget_of(r):
+        return budget if budget is not None else r["budget"]
+
+    # ---------- Extract Text (+ budget when the form gave none) ----------
+    def parse(r):
+        pages = extract_pages_parallel(file_path, PDF_MAX_PAGES, PDF_MAX_CHARS)
+        text = "".join(pages)
+
+        # ---------- Random PDF Rejection ----------
+        if len(text) < MIN_TEXT_LENGTH:
+            raise ProposalRejected(
+                "Uploaded PDF does not appear to be a valid research proposal."
+            )
+
+        if budget is not None:
+            return {"proposal_text": text}
+
+        # ---------- Budget Auto-fill (same pages, no second parse) ----------
+        detected, items, error = resolve_budget(None, extract_budget_from_pages(pages))
+        if error:
+            raise ProposalRejected(error, budget_items=items)
+
+        return {"proposal_text": text, "budget": detected, "budget_items": items}
+
+    # ---------- Novelty Benchmark ----------
+    def novelty(r):
+        novelty_result = novelty_analysis(r["proposal_text"])
+        return {
+            "novelty": float(novelty_result["novelty_score"]),
+            "similar_projects": novelty_result["similar_projects"]
+        }
+
+    # ---------- Financial Check ----------
+    def finance(r):
+        finance_result = check_finance(budget_of(r))
+        return {
+            "finance": float(finance_result["finance_score"]),
+            "violations": finance_result["violations"]
+        }
+
+    # ---------- ML + Confidence + Decision ----------
+    def ml(r):
+        features = extract_features(r["proposal_text"], r["novelty"], budget_of(r))
+        predictions = ml_evaluate_with_uncertainty(r["novelty"], budget_of(r), features=features)
+        confidence_data = estimate_confidence_band(predictions)
+        final_score = float(confidence_data["mean"])
+
+        return {
+            "features": features[0].tolist(),
+            "final_score": final_score,
+            "confidence": float(confidence_data["confidence"]),
+            "confidence_band": confidence_data,
+            "decision": get_decision(final_score)
+        }
+
+    # ---------- GenAI Narrative ----------
+    def narrative(r):
+        return {"ai_report_text": generate_ai_narrative(
+            proposal_text=r["proposal_text"],
+            novelty=r["novelty"],
+            finance=r["finance"],
+            final_score=r["final_score"],
+            decision=r["decision"]
+        )}
+
+    # ---------- Explainability + SHAP ----------
+    def explainability(r):
+        return {
+            "explanation": generate_explanation(r["novelty"], r["finance"], technical),
+            "feature_importance": get_feature_importance(),
+            "shap_values": get_shap_values(
+                novelty=r["novelty"],
+                finance=r["finance"],
+                technical=technical
+            )
+        }
+
+    # ---------- PDF Report (rendered in the background / on download) ----------
+    def report(r):
+        status = schedule_report(report_filename, {
+            "filename": "evaluation.pdf",
+            "scores": {
+                "novelty": r["novelty"],
+                "finance": r["finance"],
+                "final_score": r["final_score"]
+            },
+            "decision": r["decision"],
+            "explanation": r["explanation"],
+            "ai_narrative": r["ai_report_text"],
+            "confidence_data": r["confidence_band"]
+        })
+        return {
+            "report_url": f"http://localhost:8000/reports/{report_filename}",
+            "report_status": status
+        }
+
+    # ---------- Store in DB (group commit with concurrent requests) ----------
+    def store(r):
+        write_evaluation({
+            "filename": filename,
+            "novelty": r["novelty"],
+            "finance": r["finance"],
+            "final_score": r["final_score"],
+            "decision": r["decision"],
+            "report_path": report_path,
+            "budget": budget_of(r),
+            "proposal_text": compress_text(r["proposal_text"]),
+            "features": json.dumps(r["features"]),
+            "similar_projects": json.dumps(r["similar_projects"], default=float),
+            "pipeline_version": PIPELINE_VERSION
+        }).result()
+        return {}
+
+    stages = {
+        "parse": ([], parse),
+        "novelty": (["parse"], novelty),
+        "finance": ([] if budget is not None else ["parse"], finance),
+        "ml": (["novelty"], ml),
+        "narrative": (["ml", "finance"], narrative),
+        "explainability": (["novelty", "finance"], explainability),
+        "report": (["narrative", "explainability"], report),
+        "store": (["narrative", "report"], store)
+    }
+
+    return stages
+
+
+def evaluate_proposal(file_path, filename, budget, on_stage=None):
+    """
+    Runs the full proposal_stages() graph. on_stage(running_stages,
+    partial_result) lets job workers report progress. Returns the
+    response dict (with per-stage timings), or {"error": ...} when the
+    PDF is rejected.
+    """
+
+    # Name reserved up front so the DB insert need not wait for the render
+    report_filename = new_report_filename("evaluation.pdf")
+    stages = proposal_stages(file_path, filename, budget, report_filename)
+
+    def publish(running, outputs):
+        if on_stage:
+            on_stage(running, {k: v for k, v in outputs.items() if k != "proposal_text"})
+
+    start = time.perf_counter()
+    try:
+        results, timings = run_stage_graph(stages, publish)
+    except ProposalRejected as e:
+        return {"error": str(e), **e.details}
+
+    # ---------- Response ----------
+    results["stage_timings"] = timings
+    results["total_seconds"] = round(time.perf_counter() - start, 4)
+    return results
+
+
+# ---------------- PDF PARSING ----------------
+def get_parse_pool():
+    """
+    One process pool per API process, reused across batch requests.
+    Spawned (not forked) so workers never inherit server threads or locks.
+    """
+
+    global _parse_pool
+
+    with _pools_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=BATCH_PARSE_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return _parse_pool
+
+
+def _drop_parse_pool(pool):
+    # A worker died (e.g. OOM on a huge PDF): the next batch starts a fresh pool
+    global _parse_pool
+
+    with _pools_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_pdf(file_path, detect_budget):
+    """
+    Pool worker: the proposal text, plus the budget line items read from
+    the same pages when detect_budget (no budget given with the upload).
+    """
+
+    pages = list(iter_pdf_pages(file_path, PDF_MAX_PAGES, PDF_MAX_CHARS))
+    detected = extract_budget_from_pages(pages) if detect_budget else None
+    return "".join(pages), detected
+
+
+def extract_texts(file_paths, detect_budgets=None):
+    """
+    Parses PDFs in parallel. Returns (text, detected_budget, error) per
+    path, in order; detected_budget is None unless detect_budgets[i].
+    """
+
+    detect_budgets = detect_budgets or [False] * len(file_paths)
+    pool = get_parse_pool()
+    futures = [
+        pool.submit(_parse_pdf, path, detect)
+        for path, detect in zip(file_paths, detect_budgets)
+    ]
+
+    results = []
+    for future in futures:
+        try:
+            results.append((*future.result(), None))
+        except BrokenProcessPool:
+            _drop_parse_pool(pool)
+            results.append((None, None, "PDF parser worker crashed"))
+        except Exception as e:
+            results.append((None, None, f"Could not parse PDF: {e}"))
+
+    return results
+
+
+# ---------------- BATCH EVALUATION ----------------
+def evaluate_batch(items, db):
+    """
+    items: [{"filename": str, "file_path": str, "budget": float or None}]
+    A None budget is read from the PDF while it is parsed.
+
+    Runs parse -> novelty -> finance -> ML + confidence for all items,
+    stores every ProposalEvaluation in one transaction and returns
+    one result dict per item (with "error" for failed files).
+    The LLM narrative and PDF report are skipped for batch runs.
+    """
+
+    results = [{"filename": item["filename"]} for item in items]
+
+    # ---------- Extract Text + missing budgets (process pool) ----------
+    parsed = extract_texts(
+        [item["file_path"] for item in items],
+        [item["budget"] is None for item in items]
+    )
+
+    valid = []
+    budgets = []
+    for i, (text, detected, error) in enumerate(parsed):
+        if error is None and len(text) < MIN_TEXT_LENGTH:
+            error = "Uploaded PDF does not appear to be a valid research proposal."
+
+        budget = items[i]["budget"]
+        if error is None and budget is None:
+            budget, budget_items, error = resolve_budget(None, detected)
+            if error is None:
+                results[i]["budget"] = budget
+            else:
+                results[i]["budget_items"] = budget_items
+
+        if error:
+            results[i]["error"] = error
+        else:
+            valid.append((i, text))
+            budgets.append(float(budget))
+
+    if not valid:
+        return results
+
+    texts = [text for _, text in valid]
+
+    # ---------- Novelty (vectorized) ----------
+    novelty_results = novelty_analysis_batch(texts)
+
+    # ---------- ML + Confidence (vectorized) ----------
+    novelty_scores = [r["novelty_score"] for r in novelty_results]
+    features = extract_feature_matrix(texts, novelty_scores, budgets)
+    predictions = ml_evaluate_batch(novelty_scores, budgets, features=features)
+    bands = estimate_confidence_band(predictions, axis=1)
+
+    # ---------- Guideline Rules (vectorized) ----------
+    finance_results = check_finance_batch(budgets)
+
+    records = []
+    for row, ((i, text), budget, novelty_result) in enumerate(zip(valid, budgets, novelty_results)):
+
+        novelty_score = novelty_result["novelty_score"]
+
+        finance_result = finance_results[row]
+        finance_score = float(finance_result["finance_score"])
+
+        confidence_data = {key: float(values[row]) for key, values in bands.items()}
+        final_score = float(confidence_data["mean"])
+        decision = get_decision(final_score)
+
+        results[i].update({
+            "novelty": novelty_score,
+            "finance": finance_score,
+            "violations": finance_result["violations"],
+            "similar_projects": novelty_result["similar_projects"],
+            "final_score": final_score,
+            "confidence": float(confidence_data["confidence"]),
+            "confidence_band": confidence_data,
+            "decision": decision,
+            "explanation": generate_explanation(novelty_score, finance_score, 80.0)
+        })
+
+        records.append(ProposalEvaluation(
+            filename=items[i]["filename"],
+            novelty=novelty_score,
+            finance=finance_score,
+            final_score=final_score,
+            decision=decision,
+            report_path=None,
+            budget=budget,
+            proposal_text=compress_text(text),
+            features=json.dumps(features[row].tolist()),
+            similar_projects=json.dumps(novelty_result["similar_projects"], default=float),
+            pipeline_version=PIPELINE_VERSION
+        ))
+
+    # ---------- Store in DB (single transaction) ----------
+    db.add_all(records)
+    db.commit()
+
+    return results
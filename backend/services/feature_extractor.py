@@ -1,5 +1,11 @@
 import numpy as np
 
+from backend.services.keyword_matcher import count_terms
+
+# Feature contract of ml/evaluator_model.pkl: share of these terms present.
+# Matched through the lexicon matcher (data/tech_lexicon.json, "core_tech"),
+# without word boundaries: the model was trained on substring hits, so
+# "models" / "systems" must still count.
 TECH_KEYWORDS = [
     "algorithm", "model", "system", "framework",
     "optimization", "prediction", "deep learning",
@@ -7,9 +13,9 @@ TECH_KEYWORDS = [
 ]
 
 def extract_features(text, novelty, budget):
-    text_lower = text.lower()
+    term_counts = count_terms(text)
 
-    keyword_hits = sum(1 for k in TECH_KEYWORDS if k in text_lower)
+    keyword_hits = sum(1 for k in TECH_KEYWORDS if term_counts.get(k))
     keyword_density = keyword_hits / len(TECH_KEYWORDS)
 
     features = np.array([
@@ -20,3 +26,14 @@ def extract_features(text, novelty, budget):
     ])
 
     return features.reshape(1, -1)
+
+
+def extract_feature_matrix(texts, novelty_scores, budgets):
+    """
+    (proposals x 4) feature rows, one extract_features() per proposal.
+    """
+
+    return np.vstack([
+        extract_features(text, novelty, budget)
+        for text, novelty, budget in zip(texts, novelty_scores, budgets)
+    ])
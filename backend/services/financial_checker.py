@@ -1,16 +1,26 @@
-def check_finance(budget):
-    violations = []
-    score = 100
+from backend.services.rule_engine import evaluate_portfolio, violation_messages
+
 
-    if budget > 5000000:
-        violations.append("Budget exceeds maximum allowed limit (₹50L).")
-        score -= 30
+def check_finance(budget):
+    """
+    Total-budget guideline rules (data/guidelines.json) for one proposal.
+    """
 
-    if budget < 100000:
-        violations.append("Budget seems unrealistically low.")
-        score -= 10
+    result = evaluate_portfolio({"total": [budget]})
 
     return {
-        "finance_score": score,
-        "violations": violations
+        "finance_score": float(result["scores"][0]),
+        "violations": violation_messages(result["violations"][0])
     }
+
+
+def check_finance_batch(budgets):
+    result = evaluate_portfolio({"total": budgets})
+
+    return [
+        {
+            "finance_score": float(score),
+            "violations": violation_messages(row)
+        }
+        for score, row in zip(result["scores"], result["violations"])
+    ]
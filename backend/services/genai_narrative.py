@@ -1,20 +1,12 @@
-import os
-from openai import OpenAI
-
-# ✅ OpenRouter Config
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-
-client = OpenAI(
-    api_key=OPENROUTER_API_KEY,
-    base_url="https://openrouter.ai/api/v1"
-)
+from backend.services.llm_cache import cached_completion, astream_cached
+from backend.services.llm_client import complete, astream
 
 MODEL = "mistralai/mixtral-8x7b-instruct"
 
 
-def generate_ai_narrative(proposal_text, novelty, finance, final_score, decision):
+def build_narrative_prompt(proposal_text, novelty, finance, final_score, decision):
 
-    prompt = f"""
+    return f"""
 You are an expert research funding reviewer.
 
 Proposal Summary:
@@ -30,10 +22,25 @@ Decision: {decision}
 Write a professional evaluation narrative in 8–10 lines.
 """
 
-    response = client.chat.completions.create(
-        model=MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.4
+
+def generate_ai_narrative(proposal_text, novelty, finance, final_score, decision):
+
+    prompt = build_narrative_prompt(proposal_text, novelty, finance, final_score, decision)
+
+    return cached_completion(
+        MODEL, prompt, 0.4,
+        lambda: complete(prompt, MODEL, temperature=0.4)
     )
 
-    return response.choices[0].message.content.strip()
+
+def stream_ai_narrative(proposal_text, novelty, finance, final_score, decision):
+    """
+    Async generator of response text chunks (for SSE endpoints).
+    """
+
+    prompt = build_narrative_prompt(proposal_text, novelty, finance, final_score, decision)
+
+    return astream_cached(
+        MODEL, prompt, 0.4,
+        lambda: astream(prompt, MODEL, temperature=0.4)
+    )
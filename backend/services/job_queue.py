@@ -0,0 +1,239 @@
+"""
+Durable evaluation job queue
+----------------------------
+Jobs live in the proposal_jobs table (same SQLite DB), so queued work
+survives restarts. A pool of worker threads claims jobs one at a time
+and runs the evaluation pipeline, recording stage and partial results.
+"""
+
+import json
+import os
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta
+
+from backend.config import (
+    JOB_WORKERS,
+    JOB_POLL_INTERVAL,
+    JOB_STALE_SECONDS,
+    JOB_MAX_ATTEMPTS
+)
+from backend.database import SessionLocal
+from backend.models import ProposalJob
+from backend.services.evaluation_pipeline import evaluate_proposal
+from backend.services.evaluation_cache import store_cached_result
+
+_wakeup = threading.Event()
+_stop = threading.Event()
+_workers = []
+
+
+# ---------------- PRODUCER ----------------
+def enqueue_job(db, filename, file_path, budget, content_hash=None):
+    job = ProposalJob(
+        id=uuid.uuid4().hex,
+        filename=filename,
+        file_path=file_path,
+        content_hash=content_hash,
+        budget=budget,
+        status="queued",
+        stage="queued"
+    )
+    db.add(job)
+    db.commit()
+
+    _wakeup.set()
+    return job.id
+
+
+def find_active_job(db, content_hash, budget):
+    """
+    A queued / running job for the same upload and budget, if any,
+    so duplicate submissions share one pipeline run.
+    """
+
+    job = (
+        db.query(ProposalJob.id)
+        .filter(
+            ProposalJob.content_hash == content_hash,
+            ProposalJob.budget == budget,
+            ProposalJob.status.in_(["queued", "running"])
+        )
+        .first()
+    )
+    return job.id if job else None
+
+
+def get_job(db, job_id):
+    job = db.get(ProposalJob, job_id)
+    if job is None:
+        return None
+
+    return {
+        "job_id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "stage": job.stage,
+        "result": json.loads(job.result) if job.result else {},
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+# ---------------- CONSUMER ----------------
+def _claim_next(db):
+    """
+    Atomically moves the oldest queued job to running.
+    The status check in the UPDATE makes concurrent claims safe across
+    threads and processes: only one claimant sees rowcount == 1.
+    """
+
+    while True:
+        candidate = (
+            db.query(ProposalJob.id)
+            .filter(ProposalJob.status == "queued")
+            .order_by(ProposalJob.created_at)
+            .first()
+        )
+        if candidate is None:
+            return None
+
+        claimed = (
+            db.query(ProposalJob)
+            .filter(ProposalJob.id == candidate.id, ProposalJob.status == "queued")
+            .update({
+                "status": "running",
+                "started_at": datetime.utcnow(),
+                "attempts": ProposalJob.attempts + 1
+            }, synchronize_session=False)
+        )
+        db.commit()
+
+        if claimed == 1:
+            return db.get(ProposalJob, candidate.id)
+
+
+def _run_job(db, job):
+    partial = {}
+
+    def on_stage(stage, data):
+        partial.update(data)
+        job.stage = stage
+        job.result = json.dumps(partial, default=float)
+        db.commit()
+
+    try:
+        result = evaluate_proposal(job.file_path, job.filename, job.budget, on_stage)
+
+        if "error" in result:
+            job.status = "failed"
+            job.error = result["error"]
+            # e.g. the budget line items when the budget read from the PDF is rejected
+            job.result = json.dumps(result, default=float)
+        else:
+            job.status = "done"
+            job.stage = "done"
+            job.result = json.dumps(result, default=float)
+
+    except Exception as e:
+        db.rollback()
+        traceback.print_exc()
+        job.status = "queued" if job.attempts < JOB_MAX_ATTEMPTS else "failed"
+        job.error = f"{type(e).__name__}: {e}"
+
+    job.finished_at = datetime.utcnow() if job.status != "queued" else None
+    db.commit()
+
+    # Only once the job is committed, in its own session: a rollback in the
+    # cache write (e.g. two jobs racing on one content hash) cannot undo "done"
+    if job.status == "done" and job.content_hash:
+        _cache_result(job.content_hash, job.budget, result)
+
+
+def _cache_result(content_hash, budget, result):
+    report_name = result["report_url"].rsplit("/", 1)[-1]
+
+    db = SessionLocal()
+    try:
+        store_cached_result(
+            db, content_hash, budget, result,
+            report_path=os.path.join("reports", report_name)
+        )
+    except Exception:
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+def _worker_loop():
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            job = _claim_next(db)
+            if job is not None:
+                _run_job(db, job)
+                continue
+        except Exception:
+            traceback.print_exc()
+        finally:
+            db.close()
+
+        _wakeup.wait(JOB_POLL_INTERVAL)
+        _wakeup.clear()
+
+
+def requeue_stale_jobs():
+    """
+    Running jobs whose worker died (crash / restart) go back to the queue,
+    unless they have used up JOB_MAX_ATTEMPTS: a job that kills the
+    process every time it runs is failed instead of retried forever.
+    """
+
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        stale = db.query(ProposalJob).filter(
+            ProposalJob.status == "running",
+            ProposalJob.started_at < cutoff
+        )
+
+        failed = (
+            stale.filter(ProposalJob.attempts >= JOB_MAX_ATTEMPTS)
+            .update({
+                "status": "failed",
+                "error": "Worker died while running the job",
+                "finished_at": datetime.utcnow()
+            }, synchronize_session=False)
+        )
+        count = stale.update({"status": "queued", "stage": "queued"}, synchronize_session=False)
+        db.commit()
+
+        if failed:
+            print(f"⚠️ Failed {failed} stale job(s) after {JOB_MAX_ATTEMPTS} attempts")
+        return count
+    finally:
+        db.close()
+
+
+def start_workers(count=JOB_WORKERS):
+    requeue_stale_jobs()
+    _stop.clear()
+
+    for i in range(count):
+        worker = threading.Thread(target=_worker_loop, name=f"job-worker-{i}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+
+    print("✅ Job Workers Started:", count)
+
+
+def stop_workers():
+    _stop.set()
+    _wakeup.set()
+
+    for worker in _workers:
+        worker.join(timeout=5)
+    _workers.clear()
@@ -0,0 +1,164 @@
+"""
+Multi-pattern keyword matcher
+-----------------------------
+Compiles a term lexicon (data/tech_lexicon.json) into one regular
+expression whose alternation is laid out as a trie, so shared prefixes
+are tested once and the text is scanned in a single C-level pass
+instead of one substring search per term.
+
+Matches are case-insensitive, leftmost-longest and non-overlapping.
+Terms respect word boundaries unless marked "boundary": false.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LEXICON_PATH = os.path.join(ROOT_DIR, "data", "tech_lexicon.json")
+
+# {"pattern": compiled regex, "terms": {term: {"category", "weight"}}, "version"}
+_matcher = None
+
+
+# ---------------- LEXICON ----------------
+def load_lexicon(path=LEXICON_PATH):
+    """
+    Returns (terms, version) where terms is
+    [{"term", "category", "weight", "boundary"}] with lowercase terms.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        lexicon = json.load(f)
+
+    terms = []
+    for category, spec in lexicon["categories"].items():
+        for entry in spec["terms"]:
+            if isinstance(entry, str):
+                entry = {"term": entry}
+
+            terms.append({
+                "term": " ".join(entry["term"].lower().split()),
+                "category": category,
+                "weight": float(entry.get("weight", spec.get("weight", 1.0))),
+                "boundary": entry.get("boundary", spec.get("boundary", True))
+            })
+
+    return terms, lexicon.get("version")
+
+
+# ---------------- COMPILATION ----------------
+def _trie_regex(words):
+    """
+    Regex alternation for a set of literal words, nested by shared
+    prefix. Longer continuations are tried first, so the longest term
+    wins ("deep learning" over "deep").
+    """
+
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [
+            re.escape(ch) + emit(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A term ends here: longer terms first, then stop
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return emit(trie)
+
+
+def build_matcher(terms, version=None):
+    if not terms:
+        raise ValueError("Keyword lexicon is empty")
+
+    bounded = sorted({t["term"] for t in terms if t["boundary"]})
+    unbounded = sorted({t["term"] for t in terms if not t["boundary"]})
+
+    alternatives = []
+    if bounded:
+        alternatives.append(r"(?<!\w)" + _trie_regex(bounded) + r"(?!\w)")
+    if unbounded:
+        alternatives.append(_trie_regex(unbounded))
+
+    return {
+        "pattern": re.compile("|".join(alternatives)),
+        "terms": {t["term"]: {"category": t["category"], "weight": t["weight"]} for t in terms},
+        "version": version
+    }
+
+
+def get_matcher():
+    """
+    Matcher for the configured lexicon, compiled once per process.
+    """
+
+    global _matcher
+
+    if _matcher is None:
+        _matcher = build_matcher(*load_lexicon())
+
+    return _matcher
+
+
+def reload_matcher(path=LEXICON_PATH):
+    global _matcher
+
+    _matcher = build_matcher(*load_lexicon(path))
+    return _matcher
+
+
+# ---------------- MATCHING ----------------
+def count_terms(text, matcher=None):
+    """
+    {term: occurrences} for every lexicon term found in text.
+    """
+
+    matcher = matcher or get_matcher()
+
+    # Lexicon terms use single spaces; collapse layout whitespace from PDFs
+    normalized = " ".join(text.lower().split())
+    return dict(Counter(matcher["pattern"].findall(normalized)))
+
+
+def match_keywords(text, matcher=None):
+    """
+    Returns:
+    {
+        "terms": {term: count},
+        "categories": {category: count},
+        "weighted": {category: sum of count * weight},
+        "total": int
+    }
+    """
+
+    matcher = matcher or get_matcher()
+    term_counts = count_terms(text, matcher)
+
+    categories = Counter()
+    weighted = Counter()
+
+    for term, count in term_counts.items():
+        info = matcher["terms"][term]
+        categories[info["category"]] += count
+        weighted[info["category"]] += count * info["weight"]
+
+    return {
+        "terms": term_counts,
+        "categories": dict(categories),
+        "weighted": {k: round(v, 4) for k, v in weighted.items()},
+        "total": sum(term_counts.values())
+    }
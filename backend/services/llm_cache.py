@@ -0,0 +1,166 @@
+"""
+Persistent LLM response cache
+-----------------------------
+Narrative, reviewer chat and section scoring prompts are fully
+determined by their inputs, so responses are cached in the llm_cache
+table keyed on (model, temperature, normalised prompt).
+
+- TTL: entries older than LLM_CACHE_TTL_SECONDS are refreshed
+- LRU: beyond LLM_CACHE_MAX_ENTRIES the least recently used are evicted
+- Single-flight: concurrent identical prompts share one API call
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+from backend.config import LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_ENTRIES
+from backend.database import SessionLocal
+from backend.models import LLMCacheEntry
+
+_lock = threading.Lock()
+_in_flight = {}
+_stats = {"hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+
+
+def _count(name, n=1):
+    with _lock:
+        _stats[name] += n
+
+
+def normalize_prompt(prompt):
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def cache_key(model, prompt, temperature):
+    raw = f"{model}\x00{temperature}\x00{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _lookup(key):
+    db = SessionLocal()
+    try:
+        entry = db.get(LLMCacheEntry, key)
+        if entry is None:
+            return None
+
+        now = datetime.utcnow()
+        if entry.created_at < now - timedelta(seconds=LLM_CACHE_TTL_SECONDS):
+            return None
+
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = now
+        db.commit()
+        return entry.response
+    finally:
+        db.close()
+
+
+def _store(key, model, temperature, response):
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.merge(LLMCacheEntry(
+            key=key,
+            model=model,
+            temperature=temperature,
+            response=response,
+            hits=0,
+            created_at=now,
+            last_used_at=now
+        ))
+        db.commit()
+
+        # ---------- LRU eviction ----------
+        overflow = db.query(LLMCacheEntry).count() - LLM_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            oldest = (
+                db.query(LLMCacheEntry.key)
+                .order_by(LLMCacheEntry.last_used_at)
+                .limit(overflow)
+                .subquery()
+            )
+            db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.key.in_(oldest.select())
+            ).delete(synchronize_session=False)
+            db.commit()
+            _count("evictions", overflow)
+    finally:
+        db.close()
+
+
+def cached_completion(model, prompt, temperature, call):
+    """
+    Returns the cached response for this prompt, or runs call() once
+    (even if several threads ask at the same time) and caches its text.
+    Exceptions from call() propagate and are not cached.
+    """
+
+    key = cache_key(model, prompt, temperature)
+
+    cached = _lookup(key)
+    if cached is not None:
+        _count("hits")
+        return cached
+
+    with _lock:
+        future = _in_flight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _in_flight[key] = future
+
+    if not leader:
+        _count("shared")
+        return future.result()
+
+    _count("misses")
+    try:
+        response = call()
+        _store(key, model, temperature, response)
+        future.set_result(response)
+        return response
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+
+
+async def astream_cached(model, prompt, temperature, stream):
+    """
+    Streaming counterpart of cached_completion for SSE routes.
+    A hit is yielded as one chunk; a miss streams from stream() and
+    caches the full text once the stream completes.
+    """
+
+    key = cache_key(model, prompt, temperature)
+
+    cached = await asyncio.to_thread(_lookup, key)
+    if cached is not None:
+        _count("hits")
+        yield cached
+        return
+
+    _count("misses")
+    chunks = []
+    async for chunk in stream():
+        chunks.append(chunk)
+        yield chunk
+
+    await asyncio.to_thread(_store, key, model, temperature, "".join(chunks).strip())
+
+
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+
+    lookups = stats["hits"] + stats["misses"] + stats["shared"]
+    return {
+        **stats,
+        "hit_rate": round((stats["hits"] + stats["shared"]) / lookups, 3) if lookups else 0.0
+    }
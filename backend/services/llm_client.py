@@ -0,0 +1,276 @@
+"""
+Shared OpenRouter (OpenAI-compatible) client
+--------------------------------------------
+One pooled httpx.AsyncClient per process, running on a dedicated
+event loop thread so sync callers (job workers) and async callers
+(FastAPI routes) share the same keep-alive connections.
+
+- bounded concurrency (LLM_MAX_CONCURRENCY)
+- per-call deadline covering all retries (LLM_TIMEOUT_SECONDS)
+- jittered exponential backoff on 429 / 5xx / connection errors
+
+Point OPENROUTER_BASE_URL at benchmarks/mock_openai_server.py to test
+or load-test without the real service.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+from backend.config import (
+    OPENROUTER_BASE_URL,
+    LLM_MAX_CONCURRENCY,
+    LLM_POOL_SIZE,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES
+)
+
+RETRY_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_loop = None
+_client = None
+_semaphore = None
+_init_lock = threading.Lock()
+
+
+class LLMError(Exception):
+    pass
+
+
+# ---------------- EVENT LOOP + POOL ----------------
+def _get_loop():
+    import httpx     # imported with the first LLM call, not at API start-up
+
+    global _loop, _client, _semaphore
+
+    with _init_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+
+            async def setup():
+                client = httpx.AsyncClient(
+                    base_url=OPENROUTER_BASE_URL,
+                    limits=httpx.Limits(
+                        max_connections=LLM_POOL_SIZE,
+                        max_keepalive_connections=LLM_POOL_SIZE
+                    ),
+                    timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0)
+                )
+                return client, asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+            _client, _semaphore = asyncio.run_coroutine_threadsafe(setup(), loop).result()
+            _loop = loop
+
+    return _loop
+
+
+def _headers():
+    headers = {"Content-Type": "application/json"}
+
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    return headers
+
+
+def _backoff(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    # Full jitter: spreads retries from many workers apart
+    return random.uniform(0, min(8.0, 0.5 * 2 ** attempt))
+
+
+# ---------------- CALLS (run on the client loop) ----------------
+async def _chat(model, prompt, temperature, timeout):
+    import httpx
+
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT_SECONDS)
+
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}]
+    }
+    if temperature is not None:
+        payload["temperature"] = temperature
+
+    async with _semaphore:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMError("LLM call deadline exceeded")
+
+            retry_after = None
+            try:
+                response = await _client.post(
+                    "/chat/completions",
+                    json=payload,
+                    headers=_headers(),
+                    timeout=remaining
+                )
+                if response.status_code < 400:
+                    return response.json()["choices"][0]["message"]["content"].strip()
+
+                if response.status_code not in RETRY_STATUS:
+                    raise LLMError(
+                        f"LLM returned HTTP {response.status_code}: {response.text[:200]}"
+                    )
+
+                error = LLMError(f"LLM returned HTTP {response.status_code}")
+                retry_after = response.headers.get("Retry-After")
+
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                error = LLMError(f"LLM connection error: {e}")
+
+            if attempt == LLM_MAX_RETRIES:
+                raise error
+
+            delay = _backoff(attempt, retry_after)
+            if time.monotonic() + delay >= deadline:
+                raise error
+            await asyncio.sleep(delay)
+
+
+async def _chat_stream(model, prompt, temperature, timeout):
+    """
+    Yields content deltas from a streamed completion. Retries (same
+    policy as _chat) only happen before the first token is received.
+    """
+
+    import httpx
+
+    deadline = time.monotonic() + (timeout or LLM_TIMEOUT_SECONDS)
+
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": True
+    }
+    if temperature is not None:
+        payload["temperature"] = temperature
+
+    started = False
+
+    async with _semaphore:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMError("LLM call deadline exceeded")
+
+            retry_after = None
+            try:
+                async with _client.stream(
+                    "POST",
+                    "/chat/completions",
+                    json=payload,
+                    headers=_headers(),
+                    timeout=remaining
+                ) as response:
+
+                    if response.status_code < 400:
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                return
+                            delta = json.loads(data)["choices"][0].get("delta", {})
+                            if delta.get("content"):
+                                started = True
+                                yield delta["content"]
+                        return
+
+                    body = (await response.aread()).decode("utf-8", "replace")
+                    if response.status_code not in RETRY_STATUS:
+                        raise LLMError(f"LLM returned HTTP {response.status_code}: {body[:200]}")
+
+                    error = LLMError(f"LLM returned HTTP {response.status_code}")
+                    retry_after = response.headers.get("Retry-After")
+
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                if started:
+                    raise LLMError(f"LLM stream interrupted: {e}")
+                error = LLMError(f"LLM connection error: {e}")
+
+            if attempt == LLM_MAX_RETRIES:
+                raise error
+
+            delay = _backoff(attempt, retry_after)
+            if time.monotonic() + delay >= deadline:
+                raise error
+            await asyncio.sleep(delay)
+
+
+# ---------------- PUBLIC API ----------------
+def start_client():
+    """
+    Starts the client loop and connection pool ahead of the first call.
+    """
+
+    _get_loop()
+
+
+def complete(prompt, model, temperature=None, timeout=None):
+    """
+    Blocking chat completion for worker threads. Returns the text.
+    """
+
+    future = asyncio.run_coroutine_threadsafe(
+        _chat(model, prompt, temperature, timeout), _get_loop()
+    )
+    return future.result()
+
+
+async def acomplete(prompt, model, temperature=None, timeout=None):
+    """
+    Awaitable chat completion for async routes. The request itself runs
+    on the client loop so it uses the shared connection pool.
+    """
+
+    future = asyncio.run_coroutine_threadsafe(
+        _chat(model, prompt, temperature, timeout), _get_loop()
+    )
+    return await asyncio.wrap_future(future)
+
+
+async def astream(prompt, model, temperature=None, timeout=None):
+    """
+    Async generator of content deltas for SSE routes. The HTTP stream
+    runs on the client loop; tokens are handed to the caller's loop
+    through a queue. Closing the generator cancels the upstream call.
+    """
+
+    caller_loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    end = object()
+
+    def put(item):
+        caller_loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    async def pump():
+        try:
+            async for token in _chat_stream(model, prompt, temperature, timeout):
+                put(token)
+            put(end)
+        except Exception as e:
+            put(e)
+
+    future = asyncio.run_coroutine_threadsafe(pump(), _get_loop())
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is end:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        future.cancel()
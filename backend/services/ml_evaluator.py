@@ -1,21 +1,190 @@
+import os
+import warnings
+
 import numpy as np
 
+from backend.config import (
+    ML_ENSEMBLE_SIZE,
+    ML_RANDOM_SEED,
+    ML_PREDICT_CHUNK,
+    ML_APPLY_MIN_ROWS
+)
+from backend.services.feature_extractor import extract_feature_matrix
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODEL_PATH = os.path.join(ROOT_DIR, "ml", "evaluator_model.pkl")
+
+# Shared generator (seed with ML_RANDOM_SEED for reproducible runs)
+_rng = np.random.default_rng(ML_RANDOM_SEED)
+
+# Trained RandomForest from ml/train_model.py, flattened for vectorized
+# inference: {"model", "left", "right", "feature", "threshold", "value",
+# "depth", "n_trees", "max_nodes"}; False if it could not be loaded
+evaluator_model = None
+
+
+def _generator(rng):
+    if rng is None:
+        return _rng
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+# ---------------- TRAINED MODEL ----------------
+def compile_forest(model):
+    """
+    Packs every tree of a fitted RandomForestRegressor into padded
+    (trees x nodes) arrays. Leaves point to themselves with an infinite
+    threshold, so a fixed number of steps walks all trees at once.
+    """
+
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    n_trees = len(trees)
+    max_nodes = max(tree.node_count for tree in trees)
+
+    nodes = np.arange(max_nodes)
+    left = np.tile(nodes, (n_trees, 1))
+    right = np.tile(nodes, (n_trees, 1))
+    feature = np.zeros((n_trees, max_nodes), dtype=np.intp)
+    threshold = np.full((n_trees, max_nodes), np.inf)
+    value = np.zeros((n_trees, max_nodes))
+
+    for i, tree in enumerate(trees):
+        count = tree.node_count
+        leaf = tree.children_left == -1
+
+        left[i, :count] = np.where(leaf, nodes[:count], tree.children_left)
+        right[i, :count] = np.where(leaf, nodes[:count], tree.children_right)
+        feature[i, :count] = np.where(leaf, 0, tree.feature)
+        threshold[i, :count] = np.where(leaf, np.inf, tree.threshold)
+        value[i, :count] = tree.value[:, 0, 0]
+
+    # Flat (tree * max_nodes + node) lookups are cheaper than 2-D fancy indexing
+    return {
+        "model": model,
+        "left": left.ravel(),
+        "right": right.ravel(),
+        "feature": feature.ravel(),
+        "threshold": threshold.ravel(),
+        "value": value.ravel(),
+        "depth": max(tree.max_depth for tree in trees),
+        "n_trees": n_trees,
+        "max_nodes": max_nodes
+    }
+
+
+def load_evaluator_model(path=MODEL_PATH):
+    """
+    Loads ml/evaluator_model.pkl once (called at startup). Scoring falls
+    back to the simulated ensemble when the model is missing.
+    """
+
+    global evaluator_model
+
+    try:
+        import joblib
+
+        with warnings.catch_warnings():
+            # Pickled with another scikit-learn version; tree arrays are unchanged
+            warnings.simplefilter("ignore")
+            model = joblib.load(path)
+
+        evaluator_model = compile_forest(model)
+
+    except Exception as e:
+        print("⚠️ Evaluator model not loaded, using simulated ensemble:", e)
+        evaluator_model = False
+        return None
 
-def ml_evaluate_with_uncertainty(novelty_score, budget):
+    print("✅ Evaluator Model Loaded:", evaluator_model["n_trees"], "trees")
+    return evaluator_model
+
+
+def get_evaluator_model():
+    if evaluator_model is None:
+        load_evaluator_model()
+    return evaluator_model or None
+
+
+def predict_per_tree(features, forest=None):
+    """
+    features: (proposals x 4) from extract_features.
+    Returns (proposals x trees) predictions; the row mean equals
+    model.predict(features).
+
+    Small batches walk all trees at once in NumPy (one step per tree
+    level, no per-call scikit-learn overhead). From ML_APPLY_MIN_ROWS
+    rows, scikit-learn's compiled apply() finds every leaf in one call
+    and the leaf values are gathered from the flat table.
+    """
+
+    forest = forest or get_evaluator_model()
+
+    # scikit-learn compares float32 features against float64 thresholds
+    X = np.asarray(features, dtype=np.float32)
+    offsets = np.arange(forest["n_trees"]) * forest["max_nodes"]
+
+    out = np.empty((len(X), forest["n_trees"]))
+
+    for start in range(0, len(X), ML_PREDICT_CHUNK):
+        rows = X[start:start + ML_PREDICT_CHUNK]
+
+        if len(rows) >= ML_APPLY_MIN_ROWS:
+            node = offsets + forest["model"].apply(rows)
+        else:
+            rows = rows.astype(np.float64)
+            node = np.broadcast_to(offsets, (len(rows), forest["n_trees"]))
+
+            for _ in range(forest["depth"]):
+                x = np.take_along_axis(rows, forest["feature"][node], axis=1)
+                go_left = x <= forest["threshold"][node]
+                node = offsets + np.where(go_left, forest["left"][node], forest["right"][node])
+
+        out[start:start + len(rows)] = forest["value"][node]
+
+    return out
+
+
+# ---------------- ENSEMBLE SCORING ----------------
+def ml_evaluate_with_uncertainty(novelty_score, budget, ensemble_size=ML_ENSEMBLE_SIZE, rng=None,
+                                 text=None, features=None):
     """
-    Simulated ML Ensemble Evaluation with randomness
+    ML Ensemble Evaluation for one proposal
     Returns multiple predictions for uncertainty estimation
+    (per-tree RandomForest predictions when text or features are given)
+    """
+
+    texts = None if text is None else [text]
+    return ml_evaluate_batch([novelty_score], [budget], ensemble_size, rng, texts, features)[0].tolist()
+
+
+def ml_evaluate_batch(novelty_scores, budgets, ensemble_size=ML_ENSEMBLE_SIZE, rng=None,
+                      texts=None, features=None):
     """
+    Batch version of ml_evaluate_with_uncertainty.
+
+    With proposal texts (or their precomputed extract_features rows)
+    and the trained model loaded, returns the per-tree RandomForest
+    predictions (proposals x trees). Otherwise a simulated
+    (proposals x ensemble_size) ensemble from one vectorized draw.
+    rng: seed or np.random.Generator.
+    """
+
+    if get_evaluator_model() is not None:
+        if features is None and texts is not None:
+            features = extract_feature_matrix(texts, novelty_scores, budgets)
+        if features is not None:
+            return predict_per_tree(features)
 
-    predictions = []
+    novelty_scores = np.asarray(novelty_scores, dtype=float)
+    budgets = np.asarray(budgets, dtype=float)
 
-    for _ in range(10):  # 10 ensemble samples
-        score = (
-            0.6 * novelty_score +
-            0.4 * (100 - (budget / 1000000) * 10)
-        )
+    score = (
+        0.6 * novelty_scores +
+        0.4 * (100 - (budgets / 1000000) * 10)
+    )
 
-        noise = np.random.normal(0, 3)
-        predictions.append(score + noise)
+    noise = _generator(rng).normal(0, 3, size=(len(score), ensemble_size))
 
-    return predictions
+    return score[:, None] + noise
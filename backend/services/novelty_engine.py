@@ -1,20 +1,55 @@
-from backend.services.similarity_engine import compute_similarity
+from backend.config import NOVELTY_MODE, NOVELTY_TOP_K
+from backend.services.similarity_engine import (
+    compute_similarity_batch,
+    compute_similarity_chunked_batch
+)
+from ml.vector_store import search_similar_batch
 
 
 def novelty_analysis(proposal_text):
+    return novelty_analysis_batch([proposal_text])[0]
 
-    if proposal_text.strip() == "":
-        return {
-            "novelty_score": 0.0,
-            "similar_projects": []
-        }
 
-    novelty_score, top_matches = compute_similarity(proposal_text)
+def novelty_analysis_batch(proposal_texts):
+    """
+    Novelty for many proposals in one vectorized pass.
+    Returns one {"novelty_score", "similar_projects"} dict per text.
+    """
+
+    results = [
+        {"novelty_score": 0.0, "similar_projects": []}
+        for _ in proposal_texts
+    ]
+
+    rows = [i for i, text in enumerate(proposal_texts) if text.strip() != ""]
+    if not rows:
+        return results
+
+    texts = [proposal_texts[i] for i in rows]
+
+    # ✅ Dense (MiniLM + FAISS) neighbours when the vector index is loaded
+    dense = search_similar_batch(texts, k=NOVELTY_TOP_K)
 
-    if novelty_score != novelty_score:  # NaN check
-        novelty_score = 0.0
+    if dense is not None:
+        scored = [
+            ((1 - matches[0]["similarity"]) * 100 if matches else 100.0, matches)
+            for matches in dense
+        ]
+    elif NOVELTY_MODE == "chunked":
+        # Lexical TF-IDF, passage by passage
+        scored = compute_similarity_chunked_batch(texts)
+    else:
+        # Fallback: lexical TF-IDF index
+        scored = compute_similarity_batch(texts)
+
+    for i, (novelty_score, top_matches) in zip(rows, scored):
+
+        if novelty_score != novelty_score:  # NaN check
+            novelty_score = 0.0
+
+        results[i] = {
+            "novelty_score": float(novelty_score),
+            "similar_projects": top_matches
+        }
 
-    return {
-        "novelty_score": float(novelty_score),
-        "similar_projects": top_matches
-    }
+    return results
@@ -1,25 +1,22 @@
-import pandas as pd
+from backend.services.corpus_service import get_projects
+
 
 def load_past_projects():
     """
-    Loads NaCCER past/ongoing projects dataset.
-
-    CSV must contain at least:
-    - title
-    - objective
-    - domain
+    NaCCER past/ongoing projects, from the shared corpus
+    (backend/services/corpus_service.py, data/past_projects.csv).
 
-    File: data/past_projects.csv
+    Each row has:
+    - title       ("project" column)
+    - objective   (empty when the CSV has no objective column)
+    - domain      (defaults to "Coal R&D")
     """
 
-    df = pd.read_csv("data/past_projects.csv")
-
-    projects = []
-    for _, row in df.iterrows():
-        projects.append({
-            "title": row["title"],
-            "objective": row["objective"],
-            "domain": row.get("domain", "Coal R&D")
-        })
-
-    return projects
+    return [
+        {
+            "title": p["project"],
+            "objective": p.get("objective", ""),
+            "domain": p.get("domain") or "Coal R&D"
+        }
+        for p in get_projects()
+    ]
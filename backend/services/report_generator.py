@@ -1,17 +1,73 @@
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    Table,
-    TableStyle
-)
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 from datetime import datetime
+import copy
 import uuid
 import os
 
+# reportlab is imported on first render (render processes / warm-up),
+# not by the API modules that only reserve report names.
+
+# Built once per process: styles and the flowables that never change
+_styles = None
+_static = None
+_score_table_style = None
+
+
+def new_report_filename(filename):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    uid = uuid.uuid4().hex[:6]
+
+    return f"{timestamp}_{uid}_{filename}"
+
+
+def get_styles():
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, TableStyle
+
+    global _styles, _static, _score_table_style
+
+    if _styles is None:
+        styles = getSampleStyleSheet()
+
+        headings = {
+            "scores": "ML-Based Evaluation Scores",
+            "decision": "Funding Recommendation",
+            "similar": "Novelty Benchmarking (Similar Past Projects)",
+            "violations": "Financial Guideline Violations",
+            "xai": "Explainable AI Insights",
+            "confidence": "Model Confidence & Risk",
+            "narrative": "AI-Generated Evaluation Narrative"
+        }
+
+        _static = {
+            key: Paragraph(f"<b>{text}</b>", styles["Heading2"])
+            for key, text in headings.items()
+        }
+        _static["title"] = Paragraph(
+            "<b>AI-Based R&D Proposal Evaluation Report</b>",
+            styles["Title"]
+        )
+        _static["footer"] = Paragraph(
+            "<i>This report was automatically generated using Machine Learning, "
+            "Explainable AI, and Generative AI models. Human review is recommended.</i>",
+            styles["Italic"]
+        )
+        _score_table_style = TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+            ("FONT", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("ALIGN", (1, 1), (-1, -1), "CENTER")
+        ])
+        _styles = styles
+
+    return _styles
+
+
+def _static_flowable(key):
+    # Copies share the parsed text; layout state stays per document
+    get_styles()
+    return copy.copy(_static[key])
+
 
 def generate_report(
     filename,
@@ -21,25 +77,26 @@ def generate_report(
     ai_narrative=None,
     confidence_data=None,
     similar_projects=None,      # ✅ NEW
-    violations=None             # ✅ NEW
+    violations=None,            # ✅ NEW
+    report_filename=None        # reserve the name before rendering
 ):
-    os.makedirs("reports", exist_ok=True)
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    uid = uuid.uuid4().hex[:6]
+    os.makedirs("reports", exist_ok=True)
 
-    final_filename = f"{timestamp}_{uid}_{filename}"
+    final_filename = report_filename or new_report_filename(filename)
     file_path = os.path.join("reports", final_filename)
 
-    doc = SimpleDocTemplate(file_path, pagesize=A4)
-    styles = getSampleStyleSheet()
+    # Built under a temporary name and renamed when complete: the final
+    # path existing is what marks a report as ready to serve
+    tmp_path = f"{file_path}.{uuid.uuid4().hex[:8]}.tmp"
+    doc = SimpleDocTemplate(tmp_path, pagesize=A4)
+    styles = get_styles()
     story = []
 
     # ---------------- TITLE ----------------
-    story.append(Paragraph(
-        "<b>AI-Based R&D Proposal Evaluation Report</b>",
-        styles["Title"]
-    ))
+    story.append(_static_flowable("title"))
     story.append(Spacer(1, 14))
 
     story.append(Paragraph(
@@ -49,7 +106,7 @@ def generate_report(
     story.append(Spacer(1, 20))
 
     # ---------------- SCORES TABLE ----------------
-    story.append(Paragraph("<b>ML-Based Evaluation Scores</b>", styles["Heading2"]))
+    story.append(_static_flowable("scores"))
     story.append(Spacer(1, 8))
 
     table_data = [
@@ -60,25 +117,20 @@ def generate_report(
     ]
 
     table = Table(table_data, colWidths=[220, 120])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (1, 1), (-1, -1), "CENTER")
-    ]))
+    table.setStyle(_score_table_style)
 
     story.append(table)
     story.append(Spacer(1, 16))
 
     # ---------------- DECISION ----------------
-    story.append(Paragraph("<b>Funding Recommendation</b>", styles["Heading2"]))
+    story.append(_static_flowable("decision"))
     story.append(Spacer(1, 6))
     story.append(Paragraph(decision, styles["Normal"]))
     story.append(Spacer(1, 16))
 
     # ---------------- SIMILAR PROJECTS ----------------
     if similar_projects:
-        story.append(Paragraph("<b>Novelty Benchmarking (Similar Past Projects)</b>", styles["Heading2"]))
+        story.append(_static_flowable("similar"))
         story.append(Spacer(1, 6))
 
         for proj in similar_projects:
@@ -93,7 +145,7 @@ def generate_report(
 
     # ---------------- FINANCE VIOLATIONS ----------------
     if violations and len(violations) > 0:
-        story.append(Paragraph("<b>Financial Guideline Violations</b>", styles["Heading2"]))
+        story.append(_static_flowable("violations"))
         story.append(Spacer(1, 6))
 
         for v in violations:
@@ -104,7 +156,7 @@ def generate_report(
         story.append(Spacer(1, 16))
 
     # ---------------- XAI ----------------
-    story.append(Paragraph("<b>Explainable AI Insights</b>", styles["Heading2"]))
+    story.append(_static_flowable("xai"))
     story.append(Spacer(1, 6))
 
     for point in explanation:
@@ -119,7 +171,7 @@ def generate_report(
         upper = confidence_data["upper"]
         confidence = confidence_data["confidence"]
 
-        story.append(Paragraph("<b>Model Confidence & Risk</b>", styles["Heading2"]))
+        story.append(_static_flowable("confidence"))
         story.append(Spacer(1, 6))
 
         story.append(Paragraph(
@@ -135,7 +187,7 @@ def generate_report(
 
     # ---------------- GENAI NARRATIVE ----------------
     if ai_narrative:
-        story.append(Paragraph("<b>AI-Generated Evaluation Narrative</b>", styles["Heading2"]))
+        story.append(_static_flowable("narrative"))
         story.append(Spacer(1, 8))
 
         story.append(Paragraph(ai_narrative, styles["Normal"]))
@@ -143,12 +195,22 @@ def generate_report(
 
     # ---------------- FOOTER ----------------
     story.append(Spacer(1, 30))
-    story.append(Paragraph(
-        "<i>This report was automatically generated using Machine Learning, "
-        "Explainable AI, and Generative AI models. Human review is recommended.</i>",
-        styles["Italic"]
-    ))
+    story.append(_static_flowable("footer"))
 
-    doc.build(story)
+    try:
+        doc.build(story)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
     return final_filename, file_path
+
+
+def render_report(report_filename, payload):
+    """
+    Renders a report from its stored generate_report() arguments.
+    Top-level so render process pools can pickle it.
+    """
+
+    return generate_report(report_filename=report_filename, **payload)[1]
@@ -0,0 +1,264 @@
+"""
+Deferred PDF report rendering
+-----------------------------
+The pipeline only records what a report needs (report_renders table)
+and returns its URL. The PDF is rendered in a background process pool
+(REPORT_RENDER_MODE = "background") or on the first GET of
+/reports/{name} ("lazy"); a GET during a background render waits for it.
+
+Re-render every stored report after a template change:
+    python -m backend.services.report_renderer --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from backend.config import REPORT_RENDER_MODE, REPORT_RENDER_WORKERS
+from backend.database import SessionLocal
+from backend.models import ReportRender
+from backend.services.report_generator import render_report
+
+REPORT_DIR = "reports"
+
+_render_pool = None
+_pool_lock = threading.Lock()
+_lock = threading.Lock()
+_renders = {}       # report_filename -> Future of the render in progress
+
+
+# ---------------- STATUS ----------------
+def _set_status(report_filename, status, error=None):
+    db = SessionLocal()
+    try:
+        record = db.get(ReportRender, report_filename)
+        if record is None:
+            return
+        record.status = status
+        record.error = error
+        if status == "done":
+            record.rendered_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_render_status(report_filename):
+    db = SessionLocal()
+    try:
+        record = db.get(ReportRender, report_filename)
+        return record.status if record else None
+    finally:
+        db.close()
+
+
+def report_exists(report_filename):
+    """
+    True if the PDF is on disk or can still be rendered from its record.
+    """
+
+    if os.path.exists(os.path.join(REPORT_DIR, report_filename)):
+        return True
+    return get_render_status(report_filename) not in (None, "failed")
+
+
+# ---------------- BACKGROUND POOL ----------------
+def get_render_pool():
+    global _render_pool
+
+    with _pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=REPORT_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return _render_pool
+
+
+def _submit(report_filename, payload):
+    """
+    Starts a background render unless one is already running.
+    """
+
+    with _lock:
+        if report_filename in _renders:
+            return _renders[report_filename]
+
+        # Status first: a fast render must not be marked "rendering" after "done"
+        _set_status(report_filename, "rendering")
+        future = get_render_pool().submit(render_report, report_filename, payload)
+        _renders[report_filename] = future
+
+    def finished(f):
+        with _lock:
+            _renders.pop(report_filename, None)
+        if f.cancelled():
+            return      # shutdown: left "rendering", resumed on next start
+        error = f.exception()
+        _set_status(report_filename, "failed" if error else "done",
+                    f"{type(error).__name__}: {error}" if error else None)
+
+    future.add_done_callback(finished)
+    return future
+
+
+def schedule_report(report_filename, payload):
+    """
+    Records a report to render. payload holds generate_report()
+    keyword arguments (JSON-serialisable). Returns the render status.
+    """
+
+    db = SessionLocal()
+    try:
+        db.merge(ReportRender(
+            report_filename=report_filename,
+            status="pending",
+            payload=json.dumps(payload, default=float)
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    if REPORT_RENDER_MODE == "background":
+        _submit(report_filename, payload)
+        return "rendering"
+
+    return "pending"
+
+
+def resume_pending_renders():
+    """
+    Background mode: restarts renders cut off by a previous shutdown.
+    """
+
+    if REPORT_RENDER_MODE != "background":
+        return 0
+
+    db = SessionLocal()
+    try:
+        records = (
+            db.query(ReportRender)
+            .filter(ReportRender.status.in_(["pending", "rendering"]))
+            .all()
+        )
+        pending = [(r.report_filename, json.loads(r.payload)) for r in records]
+    finally:
+        db.close()
+
+    for report_filename, payload in pending:
+        _submit(report_filename, payload)
+
+    return len(pending)
+
+
+def stop_render_pool():
+    global _render_pool
+
+    with _pool_lock:
+        pool, _render_pool = _render_pool, None
+
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------- ON DEMAND ----------------
+def ensure_report(report_filename):
+    """
+    Returns the PDF path, rendering it first if needed (or waiting for
+    the render already in progress). None if the report is unknown.
+    """
+
+    file_path = os.path.join(REPORT_DIR, report_filename)
+
+    with _lock:
+        future = _renders.get(report_filename)
+        owner = future is None
+        if owner:
+            if os.path.exists(file_path):
+                return file_path
+            future = Future()
+            _renders[report_filename] = future
+
+    if not owner:
+        return file_path if future.result() else None
+
+    try:
+        db = SessionLocal()
+        try:
+            record = db.get(ReportRender, report_filename)
+            payload = json.loads(record.payload) if record and record.payload else None
+        finally:
+            db.close()
+
+        if payload is None:
+            future.set_result(None)
+            return None
+
+        _set_status(report_filename, "rendering")
+        try:
+            render_report(report_filename, payload)
+        except Exception as e:
+            _set_status(report_filename, "failed", f"{type(e).__name__}: {e}")
+            future.set_exception(e)
+            raise
+
+        _set_status(report_filename, "done")
+        future.set_result(file_path)
+        return file_path
+
+    finally:
+        with _lock:
+            _renders.pop(report_filename, None)
+
+
+# ---------------- BULK RE-RENDER ----------------
+def rerender_all(workers=None):
+    """
+    Re-renders every stored report in parallel (e.g. after a template
+    change). Returns (rendered, failed).
+    """
+
+    db = SessionLocal()
+    try:
+        records = db.query(ReportRender).filter(ReportRender.payload.isnot(None)).all()
+        jobs = [(r.report_filename, json.loads(r.payload)) for r in records]
+    finally:
+        db.close()
+
+    rendered = failed = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = {
+            pool.submit(render_report, name, payload): name
+            for name, payload in jobs
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            error = future.exception()
+            if error:
+                failed += 1
+                _set_status(name, "failed", f"{type(error).__name__}: {error}")
+            else:
+                rendered += 1
+                _set_status(name, "done")
+
+    print(f"✅ Reports Re-rendered: {rendered} ({failed} failed) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return rendered, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render all stored PDF reports")
+    parser.add_argument("--workers", type=int, default=None)
+    rerender_all(parser.parse_args().workers)
@@ -0,0 +1,176 @@
+"""
+Re-scoring stored evaluations
+-----------------------------
+Re-runs the scoring steps over every stored ProposalEvaluation from
+its persisted budget, novelty and feature vector, so changes to the
+evaluator model, guideline rules or decision thresholds reach history
+without re-uploading or re-parsing any PDF.
+
+Rows are read, scored and updated RESCORE_BATCH_SIZE at a time:
+one rule-engine pass, one forest pass and one bulk UPDATE per batch.
+
+    python -m backend.services.rescorer [--refeature] [--dry-run]
+
+--refeature recomputes the feature vectors from the stored (compressed)
+text first, for changes to feature_extractor or the keyword lexicon.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import update
+
+from backend.config import PIPELINE_VERSION, RESCORE_BATCH_SIZE
+from backend.database import SessionLocal
+from backend.models import ProposalEvaluation
+from backend.services.document_parser import decompress_text
+from backend.services.evaluation_pipeline import get_decision
+from backend.services.feature_extractor import extract_feature_matrix
+from backend.services.financial_checker import check_finance_batch
+from backend.services.ml_evaluator import get_evaluator_model, ml_evaluate_batch
+from backend.services.uncertainty import estimate_confidence_band
+
+
+class RescoreError(Exception):
+    pass
+
+
+def _require_model():
+    # Without the trained forest ml_evaluate_batch falls back to the
+    # simulated ensemble: re-scoring would overwrite history with noise
+    if get_evaluator_model() is None:
+        raise RescoreError(
+            "Trained evaluator model (ml/evaluator_model.pkl) is not loaded; "
+            "refusing to re-score stored evaluations"
+        )
+
+
+def _iter_batches(db, batch_size, refeature):
+    columns = [
+        ProposalEvaluation.id,
+        ProposalEvaluation.novelty,
+        ProposalEvaluation.budget,
+        ProposalEvaluation.decision,
+        ProposalEvaluation.features
+    ]
+    if refeature:
+        columns.append(ProposalEvaluation.proposal_text)
+
+    last_id = 0
+    while True:
+        rows = (
+            db.query(*columns)
+            .filter(
+                ProposalEvaluation.id > last_id,
+                ProposalEvaluation.features.isnot(None),
+                ProposalEvaluation.budget.isnot(None)
+            )
+            .order_by(ProposalEvaluation.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def rescore_batch(rows, refeature=False):
+    """
+    New finance / final_score / decision for one batch of stored rows.
+    Returns a list of UPDATE parameter dicts keyed by primary key.
+    """
+
+    _require_model()
+
+    novelty = np.array([r.novelty for r in rows], dtype=float)
+    budgets = np.array([r.budget for r in rows], dtype=float)
+
+    if refeature:
+        features = extract_feature_matrix(
+            [decompress_text(r.proposal_text) for r in rows], novelty, budgets
+        )
+    else:
+        features = np.array([json.loads(r.features) for r in rows], dtype=float)
+
+    finance = check_finance_batch(budgets)
+    bands = estimate_confidence_band(ml_evaluate_batch(novelty, budgets, features=features), axis=1)
+
+    updates = []
+    for row, r in enumerate(rows):
+        final_score = float(bands["mean"][row])
+        params = {
+            "id": r.id,
+            "finance": float(finance[row]["finance_score"]),
+            "final_score": final_score,
+            "decision": get_decision(final_score),
+            "pipeline_version": PIPELINE_VERSION
+        }
+        if refeature:
+            params["features"] = json.dumps(features[row].tolist())
+        updates.append(params)
+
+    return updates
+
+
+def rescore_evaluations(batch_size=RESCORE_BATCH_SIZE, refeature=False, dry_run=False):
+    """
+    Re-scores every stored evaluation that has persisted features.
+    Rows stored before features were persisted are counted as skipped.
+    Raises RescoreError when the trained model is not loaded.
+    """
+
+    _require_model()
+
+    start = time.perf_counter()
+    db = SessionLocal()
+
+    rescored = changed = 0
+    try:
+        for rows in _iter_batches(db, batch_size, refeature):
+            updates = rescore_batch(rows, refeature)
+
+            rescored += len(updates)
+            changed += sum(
+                1 for r, params in zip(rows, updates) if r.decision != params["decision"]
+            )
+
+            if not dry_run:
+                db.execute(update(ProposalEvaluation), updates)
+                db.commit()
+
+        skipped = db.query(ProposalEvaluation).count() - rescored
+    finally:
+        db.close()
+
+    summary = {
+        "rescored": rescored,
+        "skipped": skipped,
+        "decisions_changed": changed,
+        "pipeline_version": PIPELINE_VERSION,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    print(f"✅ Re-scored {rescored} evaluations ({changed} decisions changed) in {summary['seconds']}s")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored evaluations")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE)
+    parser.add_argument("--refeature", action="store_true",
+                        help="recompute feature vectors from the stored text")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report what would change without writing")
+    args = parser.parse_args()
+
+    try:
+        summary = rescore_evaluations(args.batch_size, args.refeature, args.dry_run)
+    except RescoreError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(json.dumps(summary, indent=2))
@@ -1,20 +1,12 @@
-import os
-from openai import OpenAI
-
-# ✅ OpenRouter Setup
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-
-client = OpenAI(
-    api_key=OPENROUTER_API_KEY,
-    base_url="https://openrouter.ai/api/v1"
-)
+from backend.services.llm_cache import cached_completion, astream_cached
+from backend.services.llm_client import complete, astream
 
 MODEL = "mistralai/mixtral-8x7b-instruct"
 
 
-def reviewer_chat_response(question, proposal_text, evaluation_summary):
+def build_reviewer_prompt(question, proposal_text, evaluation_summary):
 
-    prompt = f"""
+    return f"""
 You are a funding proposal reviewer agent.
 
 Proposal Text:
@@ -29,10 +21,25 @@ User Question:
 Answer clearly in 5–6 lines like a reviewer.
 """
 
-    response = client.chat.completions.create(
-        model=MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.5
+
+def reviewer_chat_response(question, proposal_text, evaluation_summary):
+
+    prompt = build_reviewer_prompt(question, proposal_text, evaluation_summary)
+
+    return cached_completion(
+        MODEL, prompt, 0.5,
+        lambda: complete(prompt, MODEL, temperature=0.5)
     )
 
-    return response.choices[0].message.content.strip()
+
+def stream_reviewer_chat_response(question, proposal_text, evaluation_summary):
+    """
+    Async generator of response text chunks (for SSE endpoints).
+    """
+
+    prompt = build_reviewer_prompt(question, proposal_text, evaluation_summary)
+
+    return astream_cached(
+        MODEL, prompt, 0.5,
+        lambda: astream(prompt, MODEL, temperature=0.5)
+    )
@@ -1,19 +1,165 @@
 # backend/services/rule_engine.py
+"""
+Guideline rule engine
+---------------------
+Rules live in a versioned JSON file (data/guidelines.json) and are
+compiled once into an evaluator that checks whole portfolios at a time:
+one vectorized comparison per rule over all proposals, no per-row loop.
 
-def load_guidelines():
+Audit every stored evaluation against a guideline revision:
+    python -m backend.services.rule_engine --audit [--guidelines path.json]
+"""
+
+import argparse
+import json
+import operator
+import os
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GUIDELINES_PATH = os.path.join(ROOT_DIR, "data", "guidelines.json")
+
+OPERATORS = {
+    "<=": operator.le,
+    "<": operator.lt,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "==": operator.eq
+}
+
+_engine = None
+
+
+# ---------------- LOADING ----------------
+def load_guidelines(path=GUIDELINES_PATH):
+    """
+    NaCCER / MoC S&T guideline constraints from the versioned rules file.
+    """
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compile_guidelines(guidelines):
+    """
+    Validates the rules once and returns the evaluator state:
+    {"version", "rules", "ids", "penalties", "messages"}.
+    """
+
+    rules = []
+    for rule in guidelines["rules"]:
+        if rule["op"] not in OPERATORS:
+            raise ValueError(f"Rule {rule['id']}: unknown operator {rule['op']!r}")
+
+        rules.append({
+            "id": rule["id"],
+            "field": rule["field"],
+            "compare": OPERATORS[rule["op"]],
+            "value": float(rule["value"]),
+            "ratio_of": rule.get("ratio_of")
+        })
+
+    return {
+        "version": guidelines.get("version"),
+        "rules": rules,
+        "ids": [rule["id"] for rule in rules],
+        "penalties": np.array([float(r.get("penalty", 0)) for r in guidelines["rules"]]),
+        "messages": [r.get("message", r["id"]) for r in guidelines["rules"]]
+    }
+
+
+def get_rule_engine():
+    global _engine
+
+    if _engine is None:
+        _engine = compile_guidelines(load_guidelines())
+
+    return _engine
+
+
+def reload_rule_engine(path=GUIDELINES_PATH):
+    global _engine
+
+    _engine = compile_guidelines(load_guidelines(path))
+    return _engine
+
+
+# ---------------- EVALUATION ----------------
+def _column(data, field, rows):
+    if field not in data:
+        return None
+    values = np.asarray(data[field], dtype=float)
+    return np.broadcast_to(values, (rows,)) if values.ndim == 0 else values
+
+
+def evaluate_portfolio(data, engine=None):
     """
-    NaCCER / MoC S&T guideline constraints
-    (can later be moved to YAML/JSON config)
+    data: DataFrame or {field: array} of budget breakdowns
+    (total, equipment, travel, overhead, duration, ...).
+
+    Returns {"version", "rules": [ids], "violations": bool (proposals x
+    rules), "scores": compliance score per proposal}. Rules whose field
+    (or ratio_of field) is absent, or NaN for a row, do not fire.
     """
+
+    engine = engine or get_rule_engine()
+
+    if isinstance(data, dict):
+        rows = max((np.size(v) for v in data.values()), default=0)
+    else:
+        rows = len(data)
+
+    violations = np.zeros((rows, len(engine["rules"])), dtype=bool)
+
+    for j, rule in enumerate(engine["rules"]):
+        lhs = _column(data, rule["field"], rows)
+        if lhs is None:
+            continue
+
+        rhs = rule["value"]
+        if rule["ratio_of"]:
+            base = _column(data, rule["ratio_of"], rows)
+            if base is None:
+                continue
+            rhs = rhs * base
+
+        with np.errstate(invalid="ignore"):
+            passed = rule["compare"](lhs, rhs)
+
+        violations[:, j] = ~passed & ~np.isnan(lhs) & ~np.isnan(rhs)
+
+    scores = np.maximum(0.0, 100.0 - violations @ engine["penalties"])
+
     return {
-        "max_budget": 50000000,          # ₹5 Crore
-        "overhead_limit": 0.10,          # 10%
-        "equipment_limit": 0.30,         # 30%
-        "travel_limit": 0.08,            # 8%
-        "duration_max_years": 3
+        "version": engine["version"],
+        "rules": engine["ids"],
+        "violations": violations,
+        "scores": scores
     }
 
 
+def evaluate_frame(df, engine=None):
+    """
+    DataFrame form of evaluate_portfolio: one boolean column per rule
+    plus compliance_score, indexed like df.
+    """
+
+    import pandas as pd
+
+    result = evaluate_portfolio(df, engine)
+
+    out = pd.DataFrame(result["violations"], columns=result["rules"], index=df.index)
+    out["compliance_score"] = result["scores"]
+    return out
+
+
+def violation_messages(row_violations, engine=None):
+    engine = engine or get_rule_engine()
+    return [engine["messages"][j] for j in np.flatnonzero(row_violations)]
+
+
 def validate_budget(budget_breakdown):
     """
     Checks budget allocation against guideline caps.
@@ -28,32 +174,50 @@ def validate_budget(budget_breakdown):
     }
     """
 
-    rules = load_guidelines()
-    violations = []
+    result = evaluate_portfolio({k: [v] for k, v in budget_breakdown.items()})
+
+    compliance_score = float(result["scores"][0])
+    violations = violation_messages(result["violations"][0])
+
+    return compliance_score, violations
 
-    total = budget_breakdown["total"]
 
-    # Rule 1: Max total cost
-    if total > rules["max_budget"]:
-        violations.append("Total budget exceeds maximum allowed limit.")
+# ---------------- AUDIT ----------------
+def audit_stored_proposals(path=GUIDELINES_PATH):
+    """
+    Re-checks every stored evaluation's budget against a guideline file.
+    Returns a per-rule violation count summary.
+    """
 
-    # Rule 2: Overhead cap
-    if budget_breakdown["overhead"] > rules["overhead_limit"] * total:
-        violations.append("Overhead exceeds 10% guideline cap.")
+    import pandas as pd
 
-    # Rule 3: Equipment cap
-    if budget_breakdown["equipment"] > rules["equipment_limit"] * total:
-        violations.append("Equipment cost exceeds 30% guideline cap.")
+    from backend.database import engine as db_engine
 
-    # Rule 4: Travel cap
-    if budget_breakdown["travel"] > rules["travel_limit"] * total:
-        violations.append("Travel cost exceeds 8% guideline cap.")
+    start = time.perf_counter()
+    rule_engine = compile_guidelines(load_guidelines(path))
 
-    # Rule 5: Duration constraint
-    if budget_breakdown["duration"] > rules["duration_max_years"]:
-        violations.append("Project duration exceeds 3-year maximum allowed.")
+    df = pd.read_sql(
+        "SELECT id, budget AS total FROM proposal_evaluations WHERE budget IS NOT NULL",
+        db_engine
+    )
+    result = evaluate_frame(df, rule_engine)
 
-    # Final compliance score
-    compliance_score = max(0, 100 - len(violations) * 20)
+    summary = {
+        "version": rule_engine["version"],
+        "proposals": len(df),
+        "non_compliant": int((result["compliance_score"] < 100).sum()),
+        "violations": {rule: int(result[rule].sum()) for rule in rule_engine["ids"]},
+        "mean_compliance": round(float(result["compliance_score"].mean()), 2) if len(df) else None,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    return summary
 
-    return compliance_score, violations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Guideline rule engine")
+    parser.add_argument("--audit", action="store_true", help="audit stored evaluations")
+    parser.add_argument("--guidelines", default=GUIDELINES_PATH)
+    args = parser.parse_args()
+
+    if args.audit:
+        print(json.dumps(audit_stored_proposals(args.guidelines), indent=2))
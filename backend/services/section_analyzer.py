@@ -1,33 +1,154 @@
+import bisect
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+
+from backend.config import SECTION_CACHE_SIZE, NOVELTY_CHUNK_CHARS
+
+SECTION_CHARS = 1200
+
+# section: (start keywords, end keywords); None = runs to the end
+SECTION_RULES = {
+    "Objectives": (["objectives", "aim", "goal"], ["methodology", "approach", "innovation"]),
+    "Methodology": (["methodology", "approach"], ["innovation", "impact", "expected outcome"]),
+    "Innovation": (["innovation", "novelty"], ["impact", "expected outcome", "risk"]),
+    "Expected Impact": (["impact", "expected outcome"], ["risk", "feasibility", "budget"]),
+    "Risk & Feasibility": (["risk", "feasibility"], None)
+}
+
+# Every anchor keyword in one alternation: a single scan finds them all
+ANCHOR_PATTERN = re.compile("|".join(sorted(
+    {re.escape(k) for starts, ends in SECTION_RULES.values() for k in starts + (ends or [])},
+    key=len, reverse=True
+)))
+
+_cache = OrderedDict()      # sha256(text) -> sections, least recently used first
+_cache_lock = threading.Lock()
+
+
+def find_anchors(text):
+    """
+    {keyword: [(start, end), ...]} for every anchor keyword, in order.
+    """
+
+    anchors = {}
+    pos = 0
+
+    # Resume one character after each hit rather than after its end, so
+    # overlapping keywords are kept: PDF text often runs words together
+    # and "dataimpact" holds both "aim" and "impact".
+    while True:
+        match = ANCHOR_PATTERN.search(text, pos)
+        if match is None:
+            return anchors
+
+        anchors.setdefault(match.group(), []).append((match.start(), match.end()))
+        pos = match.start() + 1
+
+
+def _first(anchors, keywords, after=0):
+    """
+    Earliest occurrence of any keyword starting at or after `after`.
+    """
+
+    best = None
+    for keyword in keywords:
+        positions = anchors.get(keyword)
+        if not positions:
+            continue
+        i = bisect.bisect_left(positions, (after, -1))
+        if i < len(positions) and (best is None or positions[i] < best):
+            best = positions[i]
+    return best
+
+
+def segment_sections(text):
+    """
+    Slices sections by anchor offsets: each section starts after the
+    first start keyword and stops at the first end keyword after it
+    (same result as the former per-section lazy regexes, in one scan).
+    """
+
+    anchors = find_anchors(text)
+    sections = {}
+
+    for name, (starts, ends) in SECTION_RULES.items():
+        sections[name] = ""
+
+        start = _first(anchors, starts)
+        if start is None:
+            continue
+
+        if ends is None:
+            sections[name] = text[start[1]:start[1] + SECTION_CHARS]
+            continue
+
+        end = _first(anchors, ends, after=start[1])
+        if end is not None:
+            sections[name] = text[start[1]:end[0]][:SECTION_CHARS]
+
+    return sections
 
 
 def extract_sections(proposal_text: str):
     """
     Extracts major proposal sections using keyword-based detection.
     Works for most R&D proposal PDFs.
+    Cached per document hash, so repeated consumers share one pass.
     """
 
-    sections = {
-        "Objectives": "",
-        "Methodology": "",
-        "Innovation": "",
-        "Expected Impact": "",
-        "Risk & Feasibility": ""
-    }
+    key = hashlib.sha256(proposal_text.encode("utf-8", "surrogatepass")).hexdigest()
 
-    patterns = {
-        "Objectives": r"(objectives|aim|goal)(.*?)(methodology|approach|innovation)",
-        "Methodology": r"(methodology|approach)(.*?)(innovation|impact|expected outcome)",
-        "Innovation": r"(innovation|novelty)(.*?)(impact|expected outcome|risk)",
-        "Expected Impact": r"(impact|expected outcome)(.*?)(risk|feasibility|budget)",
-        "Risk & Feasibility": r"(risk|feasibility)(.*)"
-    }
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return dict(_cache[key])
 
-    text = proposal_text.lower()
+    sections = segment_sections(proposal_text.lower())
 
-    for key, pattern in patterns.items():
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            sections[key] = match.group(2)[:1200]
+    with _cache_lock:
+        _cache[key] = sections
+        while len(_cache) > SECTION_CACHE_SIZE:
+            _cache.popitem(last=False)
 
-    return sections
+    return dict(sections)
+
+
+def split_passages(text, max_chars=NOVELTY_CHUNK_CHARS):
+    """
+    [(start, end)] offsets covering the whole text, in order: cut at the
+    section anchors (SECTION_RULES start keywords) where possible, then
+    into windows of at most max_chars ending on whitespace. Pieces
+    shorter than a quarter window are merged into the previous passage.
+    """
+
+    lowered = text.lower()
+    cuts = {0, len(text)}
+
+    # lower() can change the length of some non-ASCII text: offsets would drift
+    if len(lowered) == len(text):
+        starts = {k for keywords, _ in SECTION_RULES.values() for k in keywords}
+        for keyword, positions in find_anchors(lowered).items():
+            if keyword in starts:
+                cuts.update(start for start, _ in positions)
+
+    passages = []
+    min_chars = max_chars // 4
+    bounds = sorted(cuts)
+
+    for section_start, section_end in zip(bounds, bounds[1:]):
+        start = section_start
+        while start < section_end:
+            end = min(start + max_chars, section_end)
+            if end < section_end:
+                space = text.rfind(" ", start + min_chars, end)
+                end = space + 1 if space != -1 else end
+
+            if passages and end - start < min_chars and end - passages[-1][0] <= max_chars:
+                passages[-1] = (passages[-1][0], end)
+            else:
+                passages.append((start, end))
+            start = end
+
+    return passages
@@ -1,8 +1,37 @@
-import requests
-import os
+import ast
+import json
 
+from backend.services.llm_cache import cached_completion
+from backend.services.llm_client import complete
+from backend.services.section_analyzer import extract_sections
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+
+MODEL = "mistralai/mixtral-8x7b"
+
+
+def parse_section_scores(response):
+    """
+    {section: score} from the model's JSON reply (code fences or text
+    around the object are ignored). Raises ValueError otherwise; the
+    reply is data, never evaluated as code.
+    """
+
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object in section scores")
+
+    body = response[start:end + 1]
+    try:
+        scores = json.loads(body)
+    except ValueError:
+        scores = ast.literal_eval(body)     # single-quoted dict literal
+
+    if not isinstance(scores, dict) or not all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in scores.values()
+    ):
+        raise ValueError("Section scores must map section names to numbers")
+
+    return {str(k): float(v) for k, v in scores.items()}
 
 
 def score_sections_with_genai(sections: dict):
@@ -36,23 +65,17 @@ Proposal Sections:
 {sections}
 """
 
-    response = requests.post(
-        "https://openrouter.ai/api/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": "mistralai/mixtral-8x7b",
-            "messages": [{"role": "user", "content": prompt}]
-        }
-    )
+    def call():
+        response = complete(prompt, MODEL)
+        parse_section_scores(response)  # unparseable replies raise: never cached
+        return response
 
     try:
-        result = response.json()["choices"][0]["message"]["content"]
-        return eval(result)
+        # Server-default temperature -> cached under None
+        result = cached_completion(MODEL, prompt, None, call)
+        return parse_section_scores(result)
 
-    except:
+    except Exception:
         return {
             "Objectives": 70,
             "Methodology": 70,
@@ -60,3 +83,11 @@ Proposal Sections:
             "Expected Impact": 70,
             "Risk & Feasibility": 70
         }
+
+
+def score_proposal_sections(proposal_text):
+    """
+    Segments the proposal (cached per document) and scores its sections.
+    """
+
+    return score_sections_with_genai(extract_sections(proposal_text))
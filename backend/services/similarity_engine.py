@@ -1,43 +1,259 @@
-import pandas as pd
 import os
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import pickle
 
+import numpy as np
 
-def compute_similarity(proposal_text):
+from backend.config import NOVELTY_CHUNK_BATCH, NOVELTY_TOP_K
+from backend.services.corpus_service import appended_since, get_projects, load_index
+from backend.services.section_analyzer import split_passages
+
+# scikit-learn / scipy / joblib are imported where used: they account for
+# most of the API's import time and are only needed once the index loads
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INDEX_PATH = os.path.join(ROOT_DIR, "data", "novelty_index.joblib")
 
-    # ✅ Correct path (data/past_projects.csv)
-    ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    csv_path = os.path.join(ROOT_DIR, "data", "past_projects.csv")
+# Pre-fitted novelty index (vectorizer + L2-normalised corpus matrix)
+novelty_index = None
 
-    df = pd.read_csv(csv_path)
 
-    # Required column
-    if "project" not in df.columns:
-        raise ValueError("CSV must contain a 'project' column")
+def _index_rows(projects):
+    return [{"project": p["project"], "url": p["url"]} for p in projects]
 
-    if "url" not in df.columns:
-        df["url"] = ""
 
-    titles = df["project"].fillna("").tolist()
+def build_novelty_index(index_path=INDEX_PATH):
+    """
+    Fits the TF-IDF vectorizer on the whole past-project corpus once
+    and saves it together with the corpus matrix.
+    """
 
-    documents = titles + [proposal_text]
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    global novelty_index
+
+    projects = _index_rows(get_projects())
+    titles = [p["project"] for p in projects]
 
     vectorizer = TfidfVectorizer(stop_words="english")
-    vectors = vectorizer.fit_transform(documents)
+    matrix = vectorizer.fit_transform(titles)
+
+    # Built off to the side and swapped in whole: readers never see a partial index
+    novelty_index = {
+        "vectorizer": vectorizer,
+        "matrix": matrix.tocsr(),
+        "projects": projects
+    }
+    if index_path:
+        save_novelty_index(index_path)
+
+    print("✅ Novelty Index Built:", len(projects))
+    return novelty_index
+
+
+def save_novelty_index(index_path=INDEX_PATH):
+    # Plain C pickle: joblib.dump walks the project dicts in Python, holding
+    # the GIL for ~1 s on a 50k corpus on every ingest. joblib.load reads both.
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(novelty_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+
+
+def load_novelty_index(index_path=INDEX_PATH):
+    """
+    Loads the saved novelty index. Builds it if missing, and appends
+    any projects added to the corpus since the index was saved.
+    """
+
+    import joblib
+
+    global novelty_index
+
+    if not os.path.exists(index_path):
+        return build_novelty_index(index_path)
+
+    index = joblib.load(index_path)
+    added = appended_since(index["projects"])
+
+    if added is None:
+        # Rows were removed or rewritten -> vocabulary is stale
+        return build_novelty_index(index_path)
+
+    novelty_index = index
+    if added:
+        add_projects(added, index_path=index_path)
+
+    print("✅ Novelty Index Loaded:", len(novelty_index["projects"]))
+    return novelty_index
+
+
+def add_projects(projects, index_path=INDEX_PATH):
+    """
+    Appends projects (already in the corpus, see corpus_service) using
+    the fitted vocabulary and IDF weights. Titles with terms unseen at
+    fit time would lose them, so those trigger a full refit instead.
+
+    projects: list of {"project": ..., "url": ...}
+    """
+
+    from scipy.sparse import vstack
+
+    global novelty_index
+
+    if not projects:
+        return novelty_index
+
+    projects = _index_rows(projects)
+    index = get_novelty_index()
+
+    analyze = index["vectorizer"].build_analyzer()
+    vocabulary = index["vectorizer"].vocabulary_
+    if any(term not in vocabulary for p in projects for term in analyze(p["project"])):
+        return build_novelty_index(index_path)
+
+    new_rows = index["vectorizer"].transform([p["project"] for p in projects])
+
+    # Swap in a new dict so concurrent readers never see a partial index
+    novelty_index = {
+        "vectorizer": index["vectorizer"],
+        "matrix": vstack([index["matrix"], new_rows]).tocsr(),
+        "projects": index["projects"] + projects
+    }
+
+    if index_path:
+        save_novelty_index(index_path)
+
+    return novelty_index
+
 
-    similarities = cosine_similarity(vectors[-1], vectors[:-1]).flatten()
+def get_novelty_index():
+    if novelty_index is None:
+        # Through the corpus service so a concurrent ingest is not missed
+        load_index("novelty")
+    return novelty_index
 
-    top_indices = similarities.argsort()[-5:][::-1]
+
+def top_k(scores, k=NOVELTY_TOP_K):
+    """
+    Indices of the k largest scores along the last axis, best first:
+    argpartition is linear in the corpus size, only the k winners are
+    sorted.
+    """
+
+    k = min(k, scores.shape[-1])
+    if k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+
+    candidates = np.argpartition(scores, -k, axis=-1)[..., -k:]
+    order = np.argsort(np.take_along_axis(scores, candidates, axis=-1), axis=-1)[..., ::-1]
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def compute_similarity(proposal_text):
+    return compute_similarity_batch([proposal_text])[0]
+
+
+def compute_similarity_batch(proposal_texts):
+    """
+    Scores many proposals against the corpus with one sparse product.
+    Returns [(novelty_score, top_matches)] in input order.
+    """
+
+    from sklearn.metrics.pairwise import linear_kernel
+
+    index = get_novelty_index()
+
+    queries = index["vectorizer"].transform(proposal_texts)
+
+    # Rows are already L2-normalised, so the dot product is the cosine
+    similarities = linear_kernel(queries, index["matrix"])
+
+    top_indices = top_k(similarities)
+    novelty_scores = (1 - similarities.max(axis=1)) * 100
+
+    output = []
+    for row, indices in enumerate(top_indices):
+        results = []
+        for idx in indices:
+            results.append({
+                "project": index["projects"][idx]["project"],
+                "similarity": float(similarities[row, idx]),
+                "url": index["projects"][idx]["url"]
+            })
+
+        output.append((novelty_scores[row], results))
+
+    return output
+
+
+# ---------------- CHUNKED NOVELTY ----------------
+def compute_similarity_chunked(proposal_text, k=NOVELTY_TOP_K, batch_size=NOVELTY_CHUNK_BATCH):
+    """
+    Passage-level novelty for long proposals. The text is split into
+    passages (section_analyzer.split_passages) and every passage is
+    scored against the corpus with sparse products, batch_size passages
+    at a time, keeping only per-project running max / sum / best
+    passage. Memory is O(batch_size x corpus) whatever the length of
+    the document; time is linear in the number of passages.
+
+    Returns (novelty_score, top_matches) like compute_similarity, with
+    per match "similarity" (best passage), "mean_similarity" (over all
+    passages) and the best passage's "passage_start" / "passage_end".
+    """
+
+    passages = split_passages(proposal_text)
+    if not passages:
+        return 100.0, []
+
+    index = get_novelty_index()
+    corpus = index["matrix"].T
+    n_projects = corpus.shape[1]
+
+    best = np.zeros(n_projects)
+    total = np.zeros(n_projects)
+    best_passage = np.zeros(n_projects, dtype=np.intp)
+
+    for start in range(0, len(passages), batch_size):
+        chunk = passages[start:start + batch_size]
+        queries = index["vectorizer"].transform([proposal_text[a:b] for a, b in chunk])
+
+        # Sparse (passages x projects) cosine similarities, reduced per
+        # project from the non-zero entries only
+        similarities = (queries @ corpus).tocoo()
+        rows, cols, values = similarities.row, similarities.col, similarities.data
+
+        batch_best = np.zeros(n_projects)
+        np.maximum.at(batch_best, cols, values)
+
+        winners = values > best[cols]
+        winners &= values == batch_best[cols]
+        best_passage[cols[winners]] = start + rows[winners]
+
+        best = np.maximum(best, batch_best)
+        total += np.bincount(cols, weights=values, minlength=n_projects)
+
+    mean = total / len(passages)
 
     results = []
-    for idx in top_indices:
+    for idx in top_k(best, k):
+        passage_start, passage_end = passages[best_passage[idx]]
         results.append({
-            "project": df.iloc[idx]["project"],
-            "similarity": float(similarities[idx]),
-            "url": str(df.iloc[idx]["url"]) if not pd.isna(df.iloc[idx]["url"]) else ""
+            "project": index["projects"][idx]["project"],
+            "similarity": float(best[idx]),
+            "mean_similarity": float(mean[idx]),
+            "url": index["projects"][idx]["url"],
+            "passage_start": int(passage_start),
+            "passage_end": int(passage_end)
         })
 
-    novelty_score = (1 - similarities.max()) * 100
+    novelty_score = (1 - best.max()) * 100 if n_projects else 100.0
+    return float(novelty_score), results
+
+
+def compute_similarity_chunked_batch(proposal_texts):
+    return [compute_similarity_chunked(text) for text in proposal_texts]
+
 
-    return novelty_score, results
+if __name__ == "__main__":
+    build_novelty_index()
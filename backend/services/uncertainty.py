@@ -1,25 +1,34 @@
 import numpy as np
 
-def estimate_confidence_band(predictions):
+def estimate_confidence_band(predictions, axis=None):
     """
     predictions: list or numpy array of model scores
+
+    axis=None: one band over all predictions (dict of floats).
+    axis=k: one band per slice along axis k, e.g. axis=1 on a
+    (proposals x ensemble) matrix (dict of arrays).
     """
-    preds = np.array(predictions)
+    preds = np.asarray(predictions, dtype=float)
 
-    mean = float(np.mean(preds))
-    std = float(np.std(preds))
+    mean = np.mean(preds, axis=axis)
+    std = np.std(preds, axis=axis)
 
     # 95% confidence interval
-    lower = max(0.0, mean - 1.96 * std)
-    upper = min(100.0, mean + 1.96 * std)
+    lower = np.maximum(0.0, mean - 1.96 * std)
+    upper = np.minimum(100.0, mean + 1.96 * std)
 
     # Convert uncertainty to confidence (bounded)
-    confidence = max(0.0, min(100.0, 100 - (std * 4)))
-
-    return {
-        "mean": round(mean, 2),
-        "lower": round(lower, 2),
-        "upper": round(upper, 2),
-        "std": round(std, 2),
-        "confidence": round(confidence, 2)
+    confidence = np.clip(100 - (std * 4), 0.0, 100.0)
+
+    band = {
+        "mean": mean,
+        "lower": lower,
+        "upper": upper,
+        "std": std,
+        "confidence": confidence
     }
+
+    if axis is None:
+        return {key: round(float(value), 2) for key, value in band.items()}
+
+    return {key: np.round(value, 2) for key, value in band.items()}
@@ -0,0 +1,153 @@
+"""
+Start-up warm-up
+----------------
+Heavy libraries (scikit-learn, sentence-transformers, reportlab,
+pdfplumber, httpx) are imported where they are first used, so importing
+the API stays fast. This module loads them and the models explicitly,
+one timed step at a time, right after start-up. GET /ready only passes
+once every step has finished, so traffic is not routed to a cold worker.
+"""
+
+import importlib
+import threading
+import time
+import traceback
+
+from backend.config import WARMUP_IN_BACKGROUND
+
+_status = {
+    "state": "pending",         # pending | warming | ready | failed
+    "step": None,
+    "steps": {},                # step -> seconds
+    "errors": {},               # step -> error message
+    "seconds": None
+}
+_lock = threading.Lock()
+_thread = None
+
+
+# ---------- Steps ----------
+def _past_projects():
+    from backend.services.corpus_service import load_corpus
+    load_corpus()
+
+
+def _novelty_index():
+    from backend.services.corpus_service import load_index
+    load_index("novelty")
+
+
+def _vector_index():
+    from backend.services.corpus_service import load_index
+    load_index("vector")
+
+
+def _embedding_model():
+    from ml import vector_store
+
+    # Only needed when the dense index is in use (TF-IDF fallback otherwise)
+    if vector_store.vector_index is not None:
+        from ml.embedding_model import get_model
+        get_model()
+
+
+def _evaluator_model():
+    from backend.services.ml_evaluator import load_evaluator_model
+    load_evaluator_model()
+
+
+def _keyword_matcher():
+    from backend.services.keyword_matcher import get_matcher
+    get_matcher()
+
+
+def _guidelines():
+    from backend.services.rule_engine import get_rule_engine
+    get_rule_engine()
+
+
+def _report_styles():
+    from backend.services.report_generator import get_styles
+    get_styles()
+
+
+def _pdf_parser():
+    importlib.import_module("pdfplumber")
+
+
+def _llm_client():
+    from backend.services.llm_client import start_client
+    start_client()
+
+
+WARMUP_STEPS = [
+    ("past_projects", _past_projects),
+    ("novelty_index", _novelty_index),
+    ("vector_index", _vector_index),
+    ("embedding_model", _embedding_model),
+    ("evaluator_model", _evaluator_model),
+    ("keyword_matcher", _keyword_matcher),
+    ("guidelines", _guidelines),
+    ("report_styles", _report_styles),
+    ("pdf_parser", _pdf_parser),
+    ("llm_client", _llm_client)
+]
+
+
+# ---------- Runner ----------
+def run_warmup():
+    """
+    Runs every step in order. A failing step is recorded and the rest
+    still run; the service is then reported as failed, not ready.
+    """
+
+    start = time.perf_counter()
+
+    with _lock:
+        _status["state"] = "warming"
+
+    for name, step in WARMUP_STEPS:
+        with _lock:
+            _status["step"] = name
+
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            traceback.print_exc()
+            with _lock:
+                _status["errors"][name] = f"{type(e).__name__}: {e}"
+
+        with _lock:
+            _status["steps"][name] = round(time.perf_counter() - step_start, 3)
+
+    with _lock:
+        _status["step"] = None
+        _status["seconds"] = round(time.perf_counter() - start, 3)
+        _status["state"] = "failed" if _status["errors"] else "ready"
+
+    print(f"✅ Warm-up {_status['state']} in {_status['seconds']}s")
+
+
+def start_warmup(background=WARMUP_IN_BACKGROUND):
+    global _thread
+
+    if not background:
+        run_warmup()
+        return
+
+    _thread = threading.Thread(target=run_warmup, name="warmup", daemon=True)
+    _thread.start()
+
+
+def is_ready():
+    return _status["state"] == "ready"
+
+
+def get_warmup_status():
+    with _lock:
+        return {
+            **_status,
+            "steps": dict(_status["steps"]),
+            "errors": dict(_status["errors"])
+        }
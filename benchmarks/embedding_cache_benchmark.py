@@ -0,0 +1,81 @@
+"""
+Embedding cache benchmark (needs sentence-transformers).
+
+Encodes a synthetic corpus of project titles with EMBEDDING_MODEL:
+
+    per-text   model.encode([text]) once per text (old get_embedding path)
+    cold       encode_many with an empty cache (batched misses)
+    warm       same corpus again (all hits, no model calls)
+    +N%        corpus plus N% new titles (only the new ones are encoded)
+
+Run from the repo root:
+    python -m benchmarks.embedding_cache_benchmark --corpus 20000 --growth 1
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from backend.config import EMBEDDING_MODEL
+from ml.embedding_cache import cache_info
+from ml.embedding_model import encode_many, get_model
+
+WORDS = (
+    "ai based coal mine safety monitoring methane gas detection iot sensor "
+    "network predictive maintenance conveyor belt deep learning slope "
+    "stability drone survey overburden blasting optimisation ventilation "
+    "fire risk dust control clean coal gasification beneficiation"
+).split()
+
+
+def synthetic_titles(n, rng, prefix=""):
+    return [
+        prefix + " ".join(rng.choice(WORDS, size=rng.integers(6, 14)))
+        for _ in range(n)
+    ]
+
+
+def timed_encode(texts, cache_dir):
+    start = time.perf_counter()
+    vectors = encode_many(texts, cache_dir=cache_dir)
+    return vectors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=int, default=20000)
+    parser.add_argument("--growth", type=float, default=1.0, help="percent of new titles")
+    parser.add_argument("--per-text-sample", type=int, default=500,
+                        help="texts timed on the one-at-a-time path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = synthetic_titles(args.corpus, rng)
+    added = synthetic_titles(max(1, int(args.corpus * args.growth / 100)), rng, prefix="new ")
+    cache_dir = tempfile.mkdtemp()
+
+    model = get_model()   # load time is not part of any measurement
+
+    start = time.perf_counter()
+    for text in corpus[:args.per_text_sample]:
+        model.encode([text])
+    per_text = (time.perf_counter() - start) / args.per_text_sample * len(corpus)
+
+    cold_vectors, cold = timed_encode(corpus, cache_dir)
+    warm_vectors, warm = timed_encode(corpus, cache_dir)
+    _, grown = timed_encode(corpus + added, cache_dir)
+
+    assert np.array_equal(cold_vectors, warm_vectors)
+
+    print(f"{'path':>12} {'texts':>8} {'seconds':>9} {'vs cold':>8}")
+    print(f"{'per-text':>12} {len(corpus):>8} {per_text:>9.2f} {per_text / cold:>7.1f}x  (extrapolated)")
+    print(f"{'cold':>12} {len(corpus):>8} {cold:>9.2f} {1:>7.1f}x")
+    print(f"{'warm':>12} {len(corpus):>8} {warm:>9.3f} {warm / cold:>7.3f}x")
+    print(f"{f'+{args.growth:g}%':>12} {len(corpus) + len(added):>8} {grown:>9.3f} {grown / cold:>7.3f}x")
+    print(cache_info(EMBEDDING_MODEL, cache_dir))
+
+
+if __name__ == "__main__":
+    main()
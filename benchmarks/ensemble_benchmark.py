@@ -0,0 +1,66 @@
+"""
+Per-proposal vs batched ML ensemble scoring benchmark.
+
+Scores N synthetic proposals (novelty 0-100, budgets ₹1 lakh - ₹50 crore)
+with the per-proposal path (ml_evaluate_with_uncertainty +
+estimate_confidence_band in a loop) and the batched path
+(ml_evaluate_batch + estimate_confidence_band(axis=1)).
+
+Run from the repo root:
+    python -m benchmarks.ensemble_benchmark --proposals 1000 100000 --ensemble 10 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.ml_evaluator import ml_evaluate_batch, ml_evaluate_with_uncertainty
+from backend.services.uncertainty import estimate_confidence_band
+
+
+def loop_scores(novelty, budgets, ensemble, rng):
+    return [
+        estimate_confidence_band(ml_evaluate_with_uncertainty(n, b, ensemble, rng))["mean"]
+        for n, b in zip(novelty, budgets)
+    ]
+
+
+def batch_scores(novelty, budgets, ensemble, rng):
+    predictions = ml_evaluate_batch(novelty, budgets, ensemble, rng)
+    return estimate_confidence_band(predictions, axis=1)["mean"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--proposals", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--ensemble", type=int, nargs="+", default=[10])
+    parser.add_argument("--loop-limit", type=int, default=20000,
+                        help="skip the per-proposal loop above this many proposals")
+    args = parser.parse_args()
+
+    data_rng = np.random.default_rng(0)
+
+    print(f"{'proposals':>10} {'ensemble':>9} {'loop ms':>10} {'batch ms':>10} {'speedup':>8}")
+
+    for n in args.proposals:
+        novelty = data_rng.uniform(0, 100, n)
+        budgets = data_rng.uniform(1e5, 5e8, n)
+
+        for ensemble in args.ensemble:
+            start = time.perf_counter()
+            batch_scores(novelty, budgets, ensemble, np.random.default_rng(1))
+            batch_ms = (time.perf_counter() - start) * 1000
+
+            if n <= args.loop_limit:
+                start = time.perf_counter()
+                loop_scores(novelty, budgets, ensemble, np.random.default_rng(1))
+                loop_ms = (time.perf_counter() - start) * 1000
+                print(f"{n:>10} {ensemble:>9} {loop_ms:>10.1f} {batch_ms:>10.1f} "
+                      f"{loop_ms / batch_ms:>7.0f}x")
+            else:
+                print(f"{n:>10} {ensemble:>9} {'-':>10} {batch_ms:>10.1f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
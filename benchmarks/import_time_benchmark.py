@@ -0,0 +1,103 @@
+"""
+API import-time budget check.
+
+Imports backend.main in fresh interpreters with `python -X importtime`
+and fails (exit code 1) when the best of --runs exceeds --budget-ms, or
+when a heavy library is imported at start-up instead of in the warm-up
+phase (backend/services/warmup.py).
+
+Run from the repo root (e.g. in CI):
+    python -m benchmarks.import_time_benchmark --budget-ms 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported lazily (first use or warm-up)
+HEAVY_MODULES = [
+    "sentence_transformers",
+    "torch",
+    "sklearn",
+    "scipy",
+    "pandas",
+    "joblib",
+    "faiss",
+    "reportlab",
+    "pdfplumber",
+    "openai",
+    "httpx"
+]
+
+
+def measure_import(module="backend.main"):
+    """
+    {module name: cumulative microseconds} for one cold import.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(
+            os.environ,
+            PYTHONPATH=ROOT_DIR,
+            # importing backend.main creates the schema: keep it out of the repo
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp_dir, 'import_check.db')}"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=tmp_dir, env=env, capture_output=True, text=True
+        )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda timings: timings[args.module])
+    total_ms = best[args.module] / 1000
+
+    print(f"{args.module}: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print(f"\n{'cumulative ms':>14}  module")
+    for name, us in sorted(best.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{us / 1000:>14.1f}  {name}")
+
+    heavy = sorted(
+        name for name in best
+        if name.split(".")[0] in HEAVY_MODULES
+    )
+    heavy_roots = sorted({name.split(".")[0] for name in heavy})
+
+    failed = False
+    if heavy_roots:
+        print(f"\n❌ Heavy modules imported at start-up: {', '.join(heavy_roots)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("\n✅ Import time within budget")
+
+
+if __name__ == "__main__":
+    main()
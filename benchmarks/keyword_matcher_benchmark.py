@@ -0,0 +1,108 @@
+"""
+Per-term substring scan vs compiled trie matcher benchmark.
+
+The old feature extractor lowercased the document and ran one `in`
+scan per keyword (presence only). This compares that, and a per-term
+regex count with word boundaries (what the old approach would need for
+counts), against keyword_matcher's single-pass trie regex, for lexicons
+of increasing size: the shipped data/tech_lexicon.json padded with
+synthetic multi-word terms.
+
+Run from the repo root:
+    python -m benchmarks.keyword_matcher_benchmark --terms 100 1000 5000 --sizes-mb 1 10
+"""
+
+import argparse
+import random
+import re
+import time
+
+from backend.services.keyword_matcher import build_matcher, count_terms, load_lexicon
+
+VOCAB = (
+    "coal mine safety methane sensor underground ventilation monitoring data "
+    "model system proposal project budget analysis deep learning network "
+    "prediction hazard gas dust blasting strata roof worker transport energy "
+    "efficiency water quality emission reduction control automation"
+).split()
+
+
+def synthetic_lexicon(size, seed=0):
+    rng = random.Random(seed)
+    terms, _ = load_lexicon()
+    seen = {t["term"] for t in terms}
+
+    while len(terms) < size:
+        words = rng.sample(VOCAB, rng.randint(1, 3))
+        term = " ".join(words) + rng.choice(["", "", " system", " index", f" {rng.randint(1, 99)}"])
+        if term not in seen:
+            seen.add(term)
+            terms.append({"term": term, "category": "synthetic", "weight": 1.0, "boundary": True})
+
+    return terms[:size]
+
+
+def synthetic_document(size_mb, seed=1):
+    rng = random.Random(seed)
+    words = []
+    length = 0
+    while length < size_mb * 1_000_000:
+        word = rng.choice(VOCAB)
+        words.append(word.capitalize() if rng.random() < 0.1 else word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def substring_scan(text, terms):
+    text_lower = text.lower()
+    return sum(1 for t in terms if t in text_lower)
+
+
+def per_term_regex(text, terms):
+    text_lower = text.lower()
+    return {
+        t: n for t in terms
+        if (n := len(re.findall(r"(?<!\w)" + re.escape(t) + r"(?!\w)", text_lower)))
+    }
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--regex-limit", type=int, default=100,
+                        help="skip the per-term regex baseline above this many terms")
+    args = parser.parse_args()
+
+    print(f"{'terms':>6} {'doc MB':>7} {'build s':>8} {'substring s':>12} "
+          f"{'per-term re s':>14} {'trie s':>8} {'matches':>9}")
+
+    for size_mb in args.sizes_mb:
+        text = synthetic_document(size_mb)
+
+        for n in args.terms:
+            lexicon = synthetic_lexicon(n)
+            words = [t["term"] for t in lexicon]
+
+            matcher, build_s = timed(lambda: build_matcher(lexicon))
+            _, substring_s = timed(lambda: substring_scan(text, words))
+            counts, trie_s = timed(lambda: count_terms(text, matcher))
+
+            if n <= args.regex_limit:
+                _, regex_s = timed(lambda: per_term_regex(text, words))
+                regex_col = f"{regex_s:>14.2f}"
+            else:
+                regex_col = f"{'-':>14}"
+
+            print(f"{n:>6} {size_mb:>7g} {build_s:>8.3f} {substring_s:>12.2f} "
+                  f"{regex_col} {trie_s:>8.2f} {sum(counts.values()):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Tail-latency load test for backend/services/llm_client.py.
+
+With --mock, starts benchmarks/mock_openai_server.py in-process and
+points the client at it, so no real OpenRouter calls are made.
+
+Run from the repo root:
+    python -m benchmarks.llm_load_test --mock --requests 500 --concurrency 50
+    MOCK_ERROR_RATE=0.1 python -m benchmarks.llm_load_test --mock
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def start_mock_server(port):
+    import uvicorn
+
+    from benchmarks.mock_openai_server import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+
+def run(total, concurrency):
+    # Imported here so OPENROUTER_BASE_URL set by --mock is picked up
+    from backend.services.llm_client import complete
+
+    latencies = []
+    errors = []
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            complete(f"Load test prompt {i}", "mock-model", temperature=0.0)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    print(f"requests={total} concurrency={concurrency} ok={len(latencies)} errors={len(errors)}")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s")
+    if len(ms):
+        print(
+            f"p50={np.percentile(ms, 50):.0f}ms p95={np.percentile(ms, 95):.0f}ms "
+            f"p99={np.percentile(ms, 99):.0f}ms max={ms.max():.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mock", action="store_true")
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    if args.mock:
+        os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{args.port}/v1"
+        start_mock_server(args.port)
+
+    run(args.requests, args.concurrency)
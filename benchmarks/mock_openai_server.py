@@ -0,0 +1,77 @@
+"""
+Minimal OpenAI-compatible chat completions server for tests and load tests.
+
+Behaviour is controlled by environment variables:
+    MOCK_LATENCY_MS   mean response latency (default 200)
+    MOCK_JITTER_MS    +/- uniform jitter (default 100)
+    MOCK_ERROR_RATE   fraction of requests answered 429 / 503 (default 0)
+    MOCK_TOKEN_MS     delay between streamed tokens (default 20)
+
+Run from the repo root:
+    uvicorn benchmarks.mock_openai_server:app --port 9000
+    OPENROUTER_BASE_URL=http://127.0.0.1:9000/v1 uvicorn backend.main:app
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "200"))
+JITTER_MS = float(os.getenv("MOCK_JITTER_MS", "100"))
+ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))
+TOKEN_MS = float(os.getenv("MOCK_TOKEN_MS", "20"))
+
+app = FastAPI(title="Mock OpenAI-compatible LLM")
+
+
+def _reply_text(prompt):
+    words = prompt.split()
+    return "Mock reviewer response. " + " ".join(words[:60])
+
+
+async def _stream(model, text):
+    for i, word in enumerate(text.split(" ")):
+        await asyncio.sleep(TOKEN_MS / 1000)
+        chunk = {
+            "id": "mock-stream",
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+
+    delay = max(0.0, LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS)) / 1000
+    await asyncio.sleep(delay)
+
+    if random.random() < ERROR_RATE:
+        status = random.choice([429, 503])
+        return JSONResponse({"error": {"message": "mock overload"}}, status_code=status,
+                            headers={"Retry-After": "0.1"} if status == 429 else None)
+
+    prompt = body["messages"][-1]["content"]
+
+    if body.get("stream"):
+        return StreamingResponse(_stream(body.get("model"), _reply_text(prompt)),
+                                 media_type="text/event-stream")
+
+    return {
+        "id": f"mock-{time.time_ns()}",
+        "object": "chat.completion",
+        "model": body.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": _reply_text(prompt)},
+            "finish_reason": "stop"
+        }]
+    }
@@ -0,0 +1,86 @@
+"""
+Serial vs page-parallel PDF extraction benchmark.
+
+Builds synthetic proposals of increasing length from the sample PDF in
+uploads/ (its text plus a budget table on every page, so pdfplumber has
+real layout work) and times extract_text_from_pdf against
+extract_text_parallel for several worker counts.
+
+Run from the repo root:
+    python -m benchmarks.pdf_extract_benchmark --pages 20 100 400 --workers 2 4 8
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from backend.services.document_parser import extract_text_from_pdf, extract_text_parallel
+
+
+def build_sample(source_text, pages, path):
+    styles = getSampleStyleSheet()
+    paragraphs = [p for p in source_text.split("\n") if p.strip()][:25]
+
+    rows = [["Head", "Year 1", "Year 2", "Year 3"]] + [
+        [f"Item {i}", f"{i * 1.5:.1f} L", f"{i * 2.0:.1f} L", f"{i * 0.5:.1f} L"]
+        for i in range(1, 16)
+    ]
+
+    story = []
+    for number in range(pages):
+        story.append(Paragraph(f"Annexure {number + 1}", styles["Heading2"]))
+        for p in paragraphs:
+            story.append(Paragraph(p, styles["Normal"]))
+        table = Table(rows)
+        table.setStyle(TableStyle([("GRID", (0, 0), (-1, -1), 0.5, colors.grey)]))
+        story.append(table)
+        story.append(PageBreak())
+
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run(page_counts, worker_counts):
+    sample = sorted(glob.glob(os.path.join("uploads", "*.pdf")))[0]
+    source_text = extract_text_from_pdf(sample)
+    print(f"sample: {sample}")
+
+    header = f"{'pages':>6} {'serial s':>9}" + "".join(f" {f'w={w}':>12}" for w in worker_counts)
+    print(header)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            path = os.path.join(tmp, f"sample_{pages}.pdf")
+            build_sample(source_text, pages, path)
+
+            serial = timed(extract_text_from_pdf, path)
+            line = f"{pages:>6} {serial:>9.2f}"
+
+            for workers in worker_counts:
+                # Warm the pool so process start-up is not counted
+                extract_text_parallel(path, max_pages=workers * 2, workers=workers, min_pages=0)
+                parallel = timed(extract_text_parallel, path, workers=workers, min_pages=0)
+                line += f" {parallel:>5.2f}s x{serial / parallel:<4.1f}"
+
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", nargs="+", type=int, default=[10, 40, 160])
+    parser.add_argument("--workers", nargs="+", type=int, default=[2, 4])
+    args = parser.parse_args()
+
+    run(args.pages, args.workers)
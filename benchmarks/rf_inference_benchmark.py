@@ -0,0 +1,65 @@
+"""
+RandomForest evaluator inference benchmark (ml/evaluator_model.pkl).
+
+Compares, for single requests and batches:
+- loop:       one estimator.predict() per tree over model.estimators_
+- predict:    model.predict() (mean only, no per-tree spread)
+- vectorized: predict_per_tree() from backend/services/ml_evaluator.py
+              (NumPy traversal below ML_APPLY_MIN_ROWS, apply() + gather above)
+
+Run from the repo root:
+    python -m benchmarks.rf_inference_benchmark --batches 1 100 1000 10000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.services.ml_evaluator import get_evaluator_model, predict_per_tree
+
+
+def per_tree_loop(model, X):
+    X = X.astype(np.float32)
+    return np.column_stack([estimator.predict(X) for estimator in model.estimators_])
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per size below 10k rows")
+    args = parser.parse_args()
+
+    forest = get_evaluator_model()
+    model = forest["model"]
+    rng = np.random.default_rng(0)
+
+    print(f"{forest['n_trees']} trees, depth {forest['depth']}")
+    print(f"{'batch':>8} {'loop ms':>10} {'predict ms':>11} {'vectorized ms':>14} {'per row us':>11}")
+
+    for n in args.batches:
+        X = np.column_stack([
+            rng.uniform(0, 1, n),      # novelty / 100
+            rng.uniform(0, 5, n),      # length / 5000
+            rng.uniform(0, 1, n),      # keyword density
+            rng.uniform(0, 1, n)       # budget / 50 lakh
+        ])
+        repeat = args.repeat if n < 10000 else 1
+
+        loop_ms = timed(lambda: per_tree_loop(model, X), repeat)
+        predict_ms = timed(lambda: model.predict(X), repeat)
+        vector_ms = timed(lambda: predict_per_tree(X, forest), repeat)
+
+        print(f"{n:>8} {loop_ms:>10.2f} {predict_ms:>11.2f} {vector_ms:>14.2f} "
+              f"{vector_ms * 1000 / n:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
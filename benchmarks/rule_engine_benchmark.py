@@ -0,0 +1,64 @@
+"""
+Per-proposal vs portfolio guideline rule checking benchmark.
+
+Checks N synthetic budget breakdowns (total, equipment, travel, overhead,
+duration) against data/guidelines.json with validate_budget in a loop
+and with one evaluate_portfolio call over a DataFrame, and verifies the
+compliance scores agree.
+
+Run from the repo root:
+    python -m benchmarks.rule_engine_benchmark --proposals 10000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.services.rule_engine import evaluate_portfolio, validate_budget
+
+
+def synthetic_portfolio(n, rng):
+    total = rng.uniform(5e4, 8e6, n)
+    return pd.DataFrame({
+        "total": total,
+        "equipment": total * rng.uniform(0, 0.45, n),
+        "travel": total * rng.uniform(0, 0.12, n),
+        "overhead": total * rng.uniform(0, 0.15, n),
+        "duration": rng.integers(1, 6, n)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--proposals", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--loop-limit", type=int, default=50000,
+                        help="skip the per-proposal loop above this many proposals")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    print(f"{'proposals':>10} {'loop ms':>10} {'portfolio ms':>13} {'speedup':>8}")
+
+    for n in args.proposals:
+        df = synthetic_portfolio(n, rng)
+
+        start = time.perf_counter()
+        scores = evaluate_portfolio(df)["scores"]
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        if n > args.loop_limit:
+            print(f"{n:>10} {'-':>10} {batch_ms:>13.1f} {'-':>8}")
+            continue
+
+        start = time.perf_counter()
+        loop = [validate_budget(row)[0] for row in df.to_dict("records")]
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        assert np.array_equal(scores, loop), "portfolio and per-proposal scores differ"
+        print(f"{n:>10} {loop_ms:>10.1f} {batch_ms:>13.1f} {loop_ms / batch_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Section segmentation benchmark: former per-section lazy regexes vs the
+one-pass anchor segmenter in backend/services/section_analyzer.py.
+
+Two document shapes per size:
+- typical:  headings in order, filler text between them
+- headless: start keywords ("aim" in "claim") but no end keyword, where
+            each lazy (.*?) scan runs to the end of the document
+
+Run from the repo root:
+    python -m benchmarks.section_segmenter_benchmark --sizes-kb 5 50 500 5000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from backend.services.section_analyzer import extract_sections, segment_sections
+
+OLD_PATTERNS = {
+    "Objectives": r"(objectives|aim|goal)(.*?)(methodology|approach|innovation)",
+    "Methodology": r"(methodology|approach)(.*?)(innovation|impact|expected outcome)",
+    "Innovation": r"(innovation|novelty)(.*?)(impact|expected outcome|risk)",
+    "Expected Impact": r"(impact|expected outcome)(.*?)(risk|feasibility|budget)",
+    "Risk & Feasibility": r"(risk|feasibility)(.*)"
+}
+
+FILLER = (
+    "the proposed work studies coal seam data from several sites and "
+    "reports sensor readings with field validation and site trials "
+).split()
+
+
+def old_extract_sections(proposal_text):
+    sections = {key: "" for key in OLD_PATTERNS}
+    text = proposal_text.lower()
+
+    for key, pattern in OLD_PATTERNS.items():
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            sections[key] = match.group(2)[:1200]
+
+    return sections
+
+
+def filler(rng, chars):
+    words, length = [], 0
+    while length < chars:
+        word = rng.choice(FILLER)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def typical_document(size, rng):
+    headings = ["Objectives", "Methodology", "Innovation", "Expected Impact", "Risk and Feasibility", "Budget"]
+    part = max(1, size // len(headings))
+    return "\n".join(f"{h}\n{filler(rng, part)}" for h in headings)
+
+
+def headless_document(size, rng):
+    # "claim" contains "aim"; no methodology / approach / innovation anywhere
+    text = filler(rng, size)
+    return text.replace("site trials", "claim trials")
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    result = fn(text)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-kb", type=float, nargs="+", default=[5, 50, 500, 5000])
+    parser.add_argument("--old-limit-kb", type=float, default=500,
+                        help="skip the old regexes on headless documents above this size")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    print(f"{'shape':>9} {'size KB':>8} {'old s':>9} {'new s':>8} {'cached s':>9} {'same':>5}")
+
+    for size_kb in args.sizes_kb:
+        size = int(size_kb * 1000)
+
+        for shape, build in (("typical", typical_document), ("headless", headless_document)):
+            text = build(size, rng)
+
+            new, new_s = timed(lambda t: segment_sections(t.lower()), text)
+            extract_sections(text)
+            _, cached_s = timed(extract_sections, text)
+
+            if shape == "typical" or size_kb <= args.old_limit_kb:
+                old, old_s = timed(old_extract_sections, text)
+                print(f"{shape:>9} {size_kb:>8g} {old_s:>9.4f} {new_s:>8.4f} {cached_s:>9.4f} "
+                      f"{str(old == new):>5}")
+            else:
+                print(f"{shape:>9} {size_kb:>8g} {'-':>9} {new_s:>8.4f} {cached_s:>9.4f} {'-':>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Recall vs latency benchmark for the FAISS index modes in ml/vector_store.py.
+
+Uses clustered random unit vectors of VECTOR_DIMENSION (topics with
+nearby projects, like real title embeddings) so it runs without the
+embedding model. Recall@k is measured against the exact (flat) index.
+
+Run from the repo root:
+    python -m benchmarks.vector_index_benchmark --size 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.config import VECTOR_DIMENSION
+from ml.vector_store import create_index
+
+
+def random_unit_vectors(n, dim, rng):
+    x = rng.standard_normal((n, dim)).astype("float32")
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x
+
+
+def clustered_corpus(n, dim, rng, per_topic=100):
+    topics = random_unit_vectors(max(1, n // per_topic), dim, rng)
+    x = topics[rng.integers(0, len(topics), n)]
+    x = x + 0.6 * random_unit_vectors(n, dim, rng)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x
+
+
+def run(size, queries, k, modes):
+    rng = np.random.default_rng(0)
+    corpus = clustered_corpus(size, VECTOR_DIMENSION, rng)
+
+    # Queries near corpus points, like a proposal close to a past project
+    picks = rng.integers(0, size, queries)
+    query = corpus[picks] + 0.3 * random_unit_vectors(queries, VECTOR_DIMENSION, rng)
+    query /= np.linalg.norm(query, axis=1, keepdims=True)
+
+    truth = None
+    print(f"corpus={size} dim={VECTOR_DIMENSION} queries={queries} k={k}")
+    print(f"{'mode':<6} {'build s':>8} {'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for mode in ["flat"] + [m for m in modes if m != "flat"]:
+        start = time.perf_counter()
+        index = create_index(corpus, mode)
+        build = time.perf_counter() - start
+
+        latencies = []
+        found = []
+        for q in query:
+            t = time.perf_counter()
+            _, ids = index.search(q.reshape(1, -1), k)
+            latencies.append((time.perf_counter() - t) * 1000)
+            found.append(ids[0])
+
+        found = np.array(found)
+        if truth is None:
+            truth = found
+
+        recall = np.mean([
+            len(set(a) & set(b)) / k for a, b in zip(found, truth)
+        ])
+
+        print(
+            f"{mode:<6} {build:>8.2f} {recall:>9.3f} "
+            f"{np.percentile(latencies, 50):>8.3f} {np.percentile(latencies, 99):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["flat", "ivf", "hnsw"])
+    args = parser.parse_args()
+
+    run(args.size, args.queries, args.k, args.modes)
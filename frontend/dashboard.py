@@ -1,9 +1,42 @@
 import streamlit as st
 import requests
-import time
+import json
+from datetime import timedelta
 
 API_URL = "http://localhost:8000"
 
+
+def iter_sse(response):
+    """
+    Yields (event, data) pairs from a text/event-stream response.
+    """
+    event, data = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line == "":
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+
+
+def load_history_page(filters):
+    """
+    Appends the next /history/ page for `filters` to the session.
+    """
+
+    params = dict(filters)
+    if st.session_state.history_cursor:
+        params["cursor"] = st.session_state.history_cursor
+
+    page_data = requests.get(f"{API_URL}/history/", params=params).json()
+    st.session_state.history_items += page_data["items"]
+    st.session_state.history_cursor = page_data["next_cursor"]
+    st.session_state.history_done = page_data["next_cursor"] is None
+
+
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(page_title="AI Proposal Evaluator", layout="wide")
 
@@ -123,11 +156,14 @@ if page == "🏠 Home":
 
     file = st.file_uploader("📄 Upload Proposal PDF", type=["pdf"])
 
+    detect_budget = st.checkbox("🔎 Read budget from the proposal PDF")
+
     budget = st.number_input(
         "💰 Proposed Budget (₹)",
         min_value=100000.0,
         max_value=500000000.0,
-        step=50000.0
+        step=50000.0,
+        disabled=detect_budget
     )
 
     if st.button("🚀 Run AI Evaluation"):
@@ -136,27 +172,64 @@ if page == "🏠 Home":
             st.error("❌ Please upload a PDF file first.")
             st.stop()
 
+        # ✅ Scores arrive first, then the narrative token by token
+        score_box = st.empty()
+        narrative_box = st.empty()
+        narrative = ""
+        data = None
+
         with st.spinner("Running AI Cognitive Pipeline..."):
 
-            response = requests.post(
-                f"{API_URL}/submit/",
-                files={"file": file},
-                data={"budget": budget}
-            )
+            try:
+                response = requests.post(
+                    f"{API_URL}/submit/stream",
+                    files={"file": file},
+                    data={} if detect_budget else {"budget": budget},
+                    stream=True
+                )
+            except requests.RequestException:
+                st.error("Backend failed. Check FastAPI logs.")
+                st.stop()
 
-        if response.status_code != 200:
-            st.error("Backend failed. Check FastAPI logs.")
-            st.stop()
+            if response.status_code != 200:
+                st.error("Backend failed. Check FastAPI logs.")
+                st.stop()
 
-        try:
-            data = response.json()
-        except:
-            st.error("Server returned invalid JSON.")
-            st.stop()
+            # Budget errors come back as plain JSON, not a stream
+            if response.headers.get("content-type", "").startswith("application/json"):
+                st.error(response.json().get("error", "Evaluation failed."))
+                st.stop()
+
+            for event, payload in iter_sse(response):
+
+                if event == "error":
+                    st.error(payload["error"])
+                    st.stop()
+
+                elif event == "budget":
+                    st.info(f"💰 Budget read from proposal: ₹{payload['budget']:,.0f} "
+                            f"({len(payload['budget_items'])} amounts found)")
 
+                elif event == "scores":
+                    score_box.info(
+                        f"⭐ Score: {payload['final_score']:.1f}/100 · "
+                        f"Novelty: {payload['novelty']:.1f} · "
+                        f"Finance: {payload['finance']:.1f} · "
+                        f"{payload['decision']}"
+                    )
 
-        if "error" in data:
-            st.error(data["error"])
+                elif event == "token":
+                    narrative += payload["text"]
+                    narrative_box.markdown(f"🤖 {narrative}▌")
+
+                elif event == "done":
+                    data = payload
+
+        score_box.empty()
+        narrative_box.empty()
+
+        if data is None:
+            st.error("Evaluation stream ended unexpectedly.")
             st.stop()
 
         # ✅ Store evaluation permanently
@@ -315,23 +388,41 @@ elif page == "🤖 Reviewer Agent Chat":
             st.warning("Please type a question.")
             st.stop()
 
-        with st.spinner("🤖 Reviewer Agent is thinking..."):
+        evaluation = st.session_state.last_eval
 
-            payload = {
-                "question": question,
-                "proposal_text": st.session_state.last_eval.get("proposal_text", ""),
-            }
+        payload = {
+            "question": question,
+            "proposal_text": evaluation.get("proposal_text", ""),
+            "final_score": evaluation["final_score"],
+            "decision": evaluation["decision"]
+        }
 
-            response = requests.post(f"{API_URL}/ask/", data=payload)
+        answer_box = st.empty()
+        answer = ""
+        failed = False
 
-        if response.status_code == 200:
-            answer = response.json()["answer"]
+        try:
+            response = requests.post(f"{API_URL}/ask/stream", data=payload, stream=True)
+            response.raise_for_status()
 
-            st.session_state.chat_history.append(("user", question))
-            st.session_state.chat_history.append(("ai", answer))
+            for event, data in iter_sse(response):
+                if event == "token":
+                    answer += data["text"]
+                    answer_box.markdown(f"<div class='chat-ai'>🤖 {answer}▌</div>",
+                                        unsafe_allow_html=True)
+                elif event == "error":
+                    failed = True
 
-        else:
+        except requests.RequestException:
+            failed = True
+
+        answer_box.empty()
+
+        if failed:
             st.error("❌ Reviewer Agent Failed.")
+        else:
+            st.session_state.chat_history.append(("user", question))
+            st.session_state.chat_history.append(("ai", answer.strip()))
 
     # Display Chat History
     st.markdown("---")
@@ -353,9 +444,52 @@ elif page == "📜 Evaluation History":
     st.markdown("<h1 class='big-title'>📜 Evaluation History</h1>",
                 unsafe_allow_html=True)
 
-    history = requests.get(f"{API_URL}/history/").json()
+    # ---------------- Filters (applied server-side) ----------------
+    col1, col2, col3 = st.columns(3)
+
+    decision = col1.selectbox(
+        "📝 Decision",
+        ["All", "Strongly Recommended for Funding",
+         "Recommended with Minor Revisions", "Not Recommended"]
+    )
+    score_range = col2.slider("⭐ Score Range", 0.0, 100.0, (0.0, 100.0), step=1.0)
+    dates = col3.date_input("📅 Date Range", value=())
+
+    filters = {"min_score": score_range[0], "max_score": score_range[1]}
+    if decision != "All":
+        filters["decision"] = decision
+    if len(dates) == 2:
+        filters["created_from"] = dates[0].isoformat()
+        filters["created_to"] = (dates[1] + timedelta(days=1)).isoformat()
+
+    # New filters start again from the first page
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_items = []
+        st.session_state.history_cursor = None
+        st.session_state.history_done = False
+
+    # ---------------- Aggregates ----------------
+    stats = requests.get(f"{API_URL}/history/stats", params=filters).json()
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Evaluations", stats["count"])
+    col2.metric("Mean Score", f"{stats['mean_score']:.1f}" if stats["mean_score"] is not None else "—")
+    col3.metric(
+        "Funding Rate",
+        f"{stats['decisions'].get('Strongly Recommended for Funding', {}).get('ratio', 0) * 100:.1f}%"
+    )
+
+    if stats["count"]:
+        st.bar_chart(
+            {f"{b['from']:.0f}-{b['to']:.0f}": b["count"] for b in stats["histogram"]}
+        )
+
+    # ---------------- Pages (keyset cursor) ----------------
+    if not st.session_state.history_items and not st.session_state.history_done:
+        load_history_page(filters)
 
-    for item in history:
+    for item in st.session_state.history_items:
 
         score = float(item["final_score"])
 
@@ -387,3 +521,8 @@ elif page == "📜 Evaluation History":
             """,
             unsafe_allow_html=True
         )
+
+    if not st.session_state.history_done:
+        if st.button("⬇ Load More"):
+            load_history_page(filters)
+            st.rerun()
@@ -0,0 +1,195 @@
+"""
+Disk-backed embedding cache
+---------------------------
+One cache per embedding model in EMBEDDING_CACHE_DIR:
+
+    <model>.index   "# dim=<d>" header, then one sha256(text) per line
+    <model>.f16     float16 rows, row i <-> key line i, append-only,
+                    read through np.memmap
+
+Lookups hash the texts and only the misses are sent to the encoder, so
+re-encoding a corpus with 1% new projects costs ~1% of a full encode,
+and a lookup where everything hits never loads the model.
+Rows are written before their index lines, so a crash can only leave
+unindexed rows behind (trimmed by the next append). Appends from
+several processes are serialised with a file lock where available.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: in-process locking only
+    fcntl = None
+
+from backend.config import EMBEDDING_CACHE_DIR, EMBEDDING_BATCH_SIZE
+
+_caches = {}            # (model name, cache dir) -> cache state
+_lock = threading.Lock()
+
+
+def text_key(text):
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# ---------- Cache files ----------
+def _open_cache(model_name, cache_dir, dim=None):
+    """
+    Cache state for a model, read from disk on first use. Returns None
+    if nothing is cached yet and dim (needed to create it) is unknown.
+    """
+
+    key = (model_name, cache_dir)
+    if key in _caches:
+        _sync(_caches[key])
+        return _caches[key]
+
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    base = os.path.join(cache_dir, slug)
+    cache = {
+        "matrix_path": base + ".f16",
+        "index_path": base + ".index",
+        "lock_path": base + ".lock",
+        "dim": None,
+        "rows": {},             # text key -> row
+        "keys_read": 0,         # index bytes already parsed
+        "matrix": None
+    }
+
+    if os.path.exists(cache["index_path"]):
+        with open(cache["index_path"], "rb") as f:
+            header = f.readline()
+        cache["dim"] = int(header.decode("ascii").split("=", 1)[1])
+        cache["keys_read"] = len(header)
+    elif dim is None:
+        return None
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        with _file_lock(cache["lock_path"]):
+            if not os.path.exists(cache["index_path"]):
+                with open(cache["index_path"], "w", encoding="ascii") as f:
+                    f.write(f"# dim={dim}\n")
+        return _open_cache(model_name, cache_dir)
+
+    _caches[key] = cache
+    _sync(cache)
+    return cache
+
+
+def _sync(cache):
+    """
+    Picks up keys appended since the last sync (by this or another
+    process) and re-maps the matrix when it has grown.
+    """
+
+    with open(cache["index_path"], "rb") as f:
+        f.seek(cache["keys_read"])
+        new = f.read()
+
+    # Only whole lines: another process may be mid-append
+    complete = new[:new.rfind(b"\n") + 1]
+    for line in complete.decode("ascii").splitlines():
+        cache["rows"].setdefault(line, len(cache["rows"]))
+    cache["keys_read"] += len(complete)
+
+    count = len(cache["rows"])
+    if count and (cache["matrix"] is None or len(cache["matrix"]) < count):
+        cache["matrix"] = np.memmap(
+            cache["matrix_path"], dtype=np.float16, mode="r", shape=(count, cache["dim"])
+        )
+
+
+@contextmanager
+def _file_lock(path):
+    with open(path, "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _append(cache, keys, vectors):
+    with _file_lock(cache["lock_path"]):
+        _sync(cache)
+
+        # Skip rows another process stored meanwhile
+        fresh = [i for i, key in enumerate(keys) if key not in cache["rows"]]
+        if not fresh:
+            return
+
+        with open(cache["matrix_path"], "ab") as f:
+            # Drop orphan rows from an interrupted append so rows line up with keys
+            f.truncate(len(cache["rows"]) * cache["dim"] * 2)
+            f.write(np.ascontiguousarray(vectors[fresh], dtype=np.float16).tobytes())
+
+        with open(cache["index_path"], "a", encoding="ascii") as f:
+            f.write("".join(keys[i] + "\n" for i in fresh))
+
+        _sync(cache)
+
+
+# ---------- Lookup ----------
+def cached_encode(texts, model_name, encode_fn, batch_size=EMBEDDING_BATCH_SIZE,
+                  cache_dir=EMBEDDING_CACHE_DIR):
+    """
+    Embeddings for texts as a (len(texts) x dim) float32 array.
+
+    encode_fn(list_of_texts) -> array is only called for texts not yet
+    cached under model_name, batch_size texts at a time, and each
+    distinct text is encoded once even if repeated in the input.
+    """
+
+    keys = [text_key(text) for text in texts]
+
+    with _lock:
+        cache = _open_cache(model_name, cache_dir)
+        known = cache["rows"] if cache else {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in known and key not in missing:
+                missing[key] = text
+
+    # ---------- Misses -> model, in batches (outside the lock) ----------
+    if missing:
+        miss_keys = list(missing)
+        miss_texts = list(missing.values())
+        vectors = np.vstack([
+            np.asarray(encode_fn(miss_texts[start:start + batch_size]), dtype=np.float32)
+            for start in range(0, len(miss_texts), batch_size)
+        ])
+
+        with _lock:
+            cache = _open_cache(model_name, cache_dir, dim=vectors.shape[1])
+            _append(cache, miss_keys, vectors)
+
+    if not keys:
+        return np.zeros((0, cache["dim"] if cache else 0), dtype=np.float32)
+
+    # ---------- Gather from the memory-mapped matrix ----------
+    with _lock:
+        rows = np.fromiter((cache["rows"][key] for key in keys), dtype=np.intp, count=len(keys))
+        return np.asarray(cache["matrix"][rows], dtype=np.float32)
+
+
+def cache_info(model_name, cache_dir=EMBEDDING_CACHE_DIR):
+    with _lock:
+        cache = _open_cache(model_name, cache_dir)
+
+    if cache is None:
+        return {"model": model_name, "entries": 0, "bytes": 0}
+
+    return {
+        "model": model_name,
+        "dim": cache["dim"],
+        "entries": len(cache["rows"]),
+        "bytes": os.path.getsize(cache["matrix_path"]) if os.path.exists(cache["matrix_path"]) else 0
+    }
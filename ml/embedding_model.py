@@ -1,6 +1,61 @@
-from sentence_transformers import SentenceTransformer
+import threading
+
+import numpy as np
+
+from backend.config import EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_DIR
+from ml.embedding_cache import cached_encode
+
+# Loaded on first use (or by the startup warm-up), not at import:
+# importing sentence-transformers pulls in torch
+model = None
+_lock = threading.Lock()
+
+
+def get_model():
+    global model
+
+    with _lock:
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(EMBEDDING_MODEL)
+
+    return model
+
+
+def _encode_batch(texts):
+    return get_model().encode(
+        texts,
+        batch_size=EMBEDDING_BATCH_SIZE,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+
+
+def encode_many(texts, batch_size=EMBEDDING_BATCH_SIZE, cache_dir=EMBEDDING_CACHE_DIR,
+                cache=True):
+    """
+    L2-normalised embeddings for many texts as a float32 matrix.
+    Served from the disk cache (ml/embedding_cache.py); only texts
+    never seen before with this model are encoded, in batches.
+
+    cache=False encodes directly without touching the cache: for
+    one-off texts such as query proposals, which would otherwise grow
+    the (never evicted) cache with every submission.
+    """
+
+    texts = list(texts)
+
+    if cache:
+        return cached_encode(texts, EMBEDDING_MODEL, _encode_batch, batch_size, cache_dir)
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    return np.vstack([
+        np.asarray(_encode_batch(texts[start:start + batch_size]), dtype=np.float32)
+        for start in range(0, len(texts), batch_size)
+    ])
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def get_embedding(text):
-    return model.encode([text])[0]
+    return encode_many([text], cache=False)[0]
@@ -1,39 +1,283 @@
-import pandas as pd
+import numpy as np
+import json
 import os
 
-past_projects = []
+from backend.config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_BATCH_SIZE,
+    VECTOR_DIMENSION,
+    VECTOR_INDEX_TYPE,
+    VECTOR_NLIST,
+    VECTOR_NPROBE,
+    VECTOR_HNSW_M,
+    VECTOR_EF_SEARCH
+)
+from backend.services.corpus_service import appended_since, get_projects
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_PATH = os.path.join(BASE_DIR, "ml", "past_projects.faiss")
+META_PATH = os.path.join(BASE_DIR, "ml", "past_projects_meta.json")
 
-def load_past_projects():
+# Dense index state: {"index": faiss.Index, "projects": [...], "index_type": str}
+vector_index = None
+
+
+# --------------------------------------------------
+# DENSE VECTOR INDEX (FAISS)
+# --------------------------------------------------
+def create_index(vectors, index_type=VECTOR_INDEX_TYPE):
     """
-    Loads past project dataset safely.
-    Works even if abstract column does not exist.
+    Builds a FAISS inner-product index over L2-normalised vectors,
+    so search scores are cosine similarities.
+
+    index_type:
+    - "flat": exact search
+    - "ivf":  inverted lists, scans VECTOR_NPROBE cells per query
+    - "hnsw": graph search, VECTOR_EF_SEARCH candidates per query
     """
 
-    global past_projects
+    import faiss
+
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    dim = vectors.shape[1]
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+
+    elif index_type == "ivf":
+        # ~39 training points per cell keeps k-means stable
+        nlist = max(1, min(VECTOR_NLIST, len(vectors) // 39))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, VECTOR_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+
+    else:
+        raise ValueError(f"Unknown vector index type: {index_type}")
+
+    index.add(vectors)
+    set_search_params(index)
+
+    return index
 
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    csv_path = os.path.join(BASE_DIR, "data", "past_projects.csv")
 
-    if not os.path.exists(csv_path):
-        print("❌ past_projects.csv not found!")
+def set_search_params(index):
+    import faiss
+
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = VECTOR_EF_SEARCH
         return
 
-    df = pd.read_csv(csv_path)
+    try:
+        faiss.extract_index_ivf(index).nprobe = VECTOR_NPROBE
+    except RuntimeError:
+        pass  # flat index, nothing to tune
+
+
+def encode_texts(texts, batch_size=EMBEDDING_BATCH_SIZE, cache=True):
+    from ml.embedding_model import encode_many
+
+    # Corpus titles are cached per text: rebuilding the index only encodes
+    # new projects. Queries (cache=False) are encoded directly.
+    return np.ascontiguousarray(encode_many(texts, batch_size, cache=cache), dtype="float32")
+
+
+def _save_vector_index(state):
+    """
+    Writes the index and its sidecar through temporary files, so a
+    process that memory-maps the old index file keeps a valid mapping.
+    """
+
+    import faiss
+
+    faiss.write_index(state["index"], INDEX_PATH + ".tmp")
+    with open(META_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({
+            "model": EMBEDDING_MODEL,
+            "index_type": state["index_type"],
+            "dimension": VECTOR_DIMENSION,
+            "projects": state["projects"]
+        }, f)
+
+    os.replace(INDEX_PATH + ".tmp", INDEX_PATH)
+    os.replace(META_PATH + ".tmp", META_PATH)
+
+
+def build_vector_index(index_type=VECTOR_INDEX_TYPE):
+    """
+    Encodes the past-project corpus with the MiniLM model and writes
+    the FAISS index plus an id -> metadata sidecar (row id == FAISS id).
+    """
+
+    global vector_index
+
+    projects = [{"project": p["project"], "url": p["url"]} for p in get_projects()]
+
+    vectors = encode_texts([p["project"] for p in projects])
+    index = create_index(vectors, index_type)
+
+    state = {
+        "index": index,
+        "projects": projects,
+        "index_type": index_type
+    }
+    _save_vector_index(state)
+    vector_index = state
+
+    print("✅ Vector Index Built:", index_type, index.ntotal)
+    return vector_index
+
+
+def _writable_copy(state):
+    """
+    In-memory copy of the live index to add vectors to, or None when
+    none can be made. Memory-mapped IVF lists (OnDiskInvertedLists)
+    cannot be cloned; they are re-read from the saved file without mmap.
+    """
+
+    import faiss
+
+    try:
+        return faiss.clone_index(state["index"])
+    except RuntimeError:
+        pass
+
+    if not os.path.exists(INDEX_PATH):
+        return None
+
+    index = faiss.read_index(INDEX_PATH)
+    if index.ntotal != len(state["projects"]):
+        return None     # saved file no longer matches the live index
+    return index
+
+
+def add_vectors(projects):
+    """
+    Adds projects appended to the corpus to a copy of the live index
+    and swaps it in, so searches in flight finish on the old one.
+    IVF cells are not retrained until the next build_vector_index().
+    """
+
+    global vector_index
+
+    if not projects or vector_index is None:
+        return vector_index
+
+    current = vector_index
+    projects = [{"project": p["project"], "url": p["url"]} for p in projects]
+
+    index = _writable_copy(current)
+    if index is None:
+        return build_vector_index(current["index_type"])
+
+    index.add(encode_texts([p["project"] for p in projects]))
+    set_search_params(index)
+
+    state = {
+        "index": index,
+        "projects": current["projects"] + projects,
+        "index_type": current["index_type"]
+    }
+    _save_vector_index(state)
+    vector_index = state
+
+    return vector_index
+
+
+def load_vector_index():
+    """
+    Memory-maps the saved FAISS index (builds it on first run, adds
+    projects appended to the corpus since it was saved).
+    Leaves vector_index as None when faiss / sentence-transformers
+    are unavailable, so novelty falls back to TF-IDF.
+    """
+
+    global vector_index
+
+    try:
+        import faiss
+    except ImportError:
+        print("⚠️ faiss not installed, dense novelty disabled")
+        return None
+
+    try:
+        if not (os.path.exists(INDEX_PATH) and os.path.exists(META_PATH)):
+            return build_vector_index()
+
+        with open(META_PATH, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta["model"] != EMBEDDING_MODEL or meta["index_type"] != VECTOR_INDEX_TYPE:
+            return build_vector_index()
+
+        index = faiss.read_index(INDEX_PATH, faiss.IO_FLAG_MMAP)
+        added = appended_since(meta["projects"])
+
+        # Rows removed / rewritten, or a save interrupted between the two files
+        if added is None or index.ntotal != len(meta["projects"]):
+            return build_vector_index()
+
+        set_search_params(index)
+        vector_index = {
+            "index": index,
+            "projects": meta["projects"],
+            "index_type": meta["index_type"]
+        }
+        add_vectors(added)
+
+    except ImportError:
+        print("⚠️ sentence-transformers not installed, dense novelty disabled")
+        vector_index = None
+        return None
+
+    except Exception as e:
+        print(f"⚠️ Vector index unavailable ({type(e).__name__}: {e}), dense novelty disabled")
+        vector_index = None
+        return None
+
+    print("✅ Vector Index Loaded:", vector_index["index_type"], vector_index["index"].ntotal)
+    return vector_index
+
+
+def search_similar(text, k=5):
+    """
+    Returns the top-k past projects for a text as
+    [{"project", "url", "similarity"}], or None if no dense index is loaded.
+    """
+
+    results = search_similar_batch([text], k)
+    return results[0] if results is not None else None
+
+
+def search_similar_batch(texts, k=5):
+    """
+    Encodes all texts in one batch and runs a single FAISS search.
+    Returns one neighbour list per text, or None without a dense index.
+    """
 
-    # ✅ Ensure required column exists
-    if "project" not in df.columns:
-        raise ValueError("CSV must contain a 'project' column")
+    if vector_index is None:
+        return None
 
-    # ✅ Add missing url column if not present
-    if "url" not in df.columns:
-        df["url"] = ""
+    index = vector_index["index"]
+    queries = encode_texts(texts, cache=False)
 
-    # ✅ No abstract needed
-    past_projects = df.to_dict(orient="records")
+    scores, ids = index.search(queries, min(k, index.ntotal))
 
-    print("✅ Past Projects Loaded Successfully:", len(past_projects))
+    return [
+        [
+            {
+                "project": vector_index["projects"][i]["project"],
+                "similarity": float(score),
+                "url": vector_index["projects"][i]["url"]
+            }
+            for score, i in zip(row_scores, row_ids)
+            if i != -1
+        ]
+        for row_scores, row_ids in zip(scores, ids)
+    ]
 
 
-def get_projects():
-    return past_projects
+if __name__ == "__main__":
+    build_vector_index()
@@ -0,0 +1,30 @@
+import pytest
+
+from backend.services.budget_extractor import extract_budget_from_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Indian grouping (lakh / crore commas)
+    ("₹5,00,000", 500000),
+    ("Total: ₹12,50,000, to be released in two phases", 1250000),
+    ("INR 1,25,00,000", 12500000),
+    # Western grouping (thousands commas) must not stop at a prefix
+    ("₹1,000,000", 1000000),
+    ("INR 12,345,678", 12345678),
+    ("Rs. 2,500,000.50", 2500000.5),
+    # Currency marker directly followed by the amount
+    ("INR1,50,000", 150000),
+    ("Rs.25,000", 25000),
+    # Units
+    ("Rs. 3.5 lakh", 350000),
+    ("Rs 2 crore", 20000000),
+    ("₹1.2 Cr", 12000000),
+    ("45 lakh", 4500000),
+    ("INR 200000", 200000),
+])
+def test_extract_budget_from_text(text, expected):
+    assert extract_budget_from_text(text) == pytest.approx(expected)
+
+
+def test_no_amount():
+    assert extract_budget_from_text("No figures in this proposal.") is None
@@ -0,0 +1,26 @@
+import pytest
+
+from backend.services.feature_extractor import TECH_KEYWORDS, extract_features
+
+
+def substring_density(text):
+    # What ml/evaluator_model.pkl was trained on
+    text_lower = text.lower()
+    return sum(1 for k in TECH_KEYWORDS if k in text_lower) / len(TECH_KEYWORDS)
+
+
+@pytest.mark.parametrize("text", [
+    "Our models and systems use algorithms for predictions.",
+    "A deep learning framework for optimization of IoT automation.",
+    "Machine learning based model; automation systems.",
+    "Ecosystem-wide modelling of patriotic frameworks.",
+    "No technical content here.",
+])
+def test_keyword_density_matches_substring_scan(text):
+    features = extract_features(text, novelty=50, budget=1_000_000)
+    assert features[0, 2] == pytest.approx(substring_density(text))
+
+
+def test_plurals_count():
+    features = extract_features("models systems algorithms predictions", 50, 1_000_000)
+    assert features[0, 2] == pytest.approx(4 / len(TECH_KEYWORDS))